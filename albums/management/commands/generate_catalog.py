@@ -0,0 +1,234 @@
+import io
+import random
+import time
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from albums.models import Album
+from bandkamp.cache import ALBUM_LIST_SCOPE, bump_generation
+from songs.models import Song
+from users.models import User
+
+WORDS = (
+    "black velvet silent river golden shadow electric dream neon ghost "
+    "midnight paper crystal wild ocean broken fire northern echo heart "
+    "static glass summer winter violet iron lonely highway satellite moon"
+).split()
+
+
+def fan_out(value: str) -> tuple[int, int]:
+    low, _, high = value.partition("-")
+    try:
+        low, high = int(low), int(high or low)
+    except ValueError:
+        raise CommandError(f'Invalid fan-out "{value}". Use "N" or "MIN-MAX".')
+    if low < 0 or high < low:
+        raise CommandError(f'Invalid fan-out "{value}". Use "N" or "MIN-MAX".')
+    return low, high
+
+
+def next_id(model, using: str) -> int:
+    return (model.objects.using(using).aggregate(last=Max("pk"))["last"] or 0) + 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a synthetic catalog of users, albums and songs in streamed "
+        "batches. The same --seed always produces the same catalog."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument(
+            "--albums-per-user", type=fan_out, default="0-20", metavar="N|MIN-MAX"
+        )
+        parser.add_argument(
+            "--songs-per-album", type=fan_out, default="5-15", metavar="N|MIN-MAX"
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument("--batch-size", type=int, default=10000)
+        parser.add_argument(
+            "--password", default="1234", help="password shared by every user"
+        )
+
+    def handle(self, *args, **options):
+        self.using = options["database"]
+        self.connection = connections[self.using]
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.albums_per_user = options["albums_per_user"]
+        self.songs_per_album = options["songs_per_album"]
+        # Hashing is by far the slowest part of creating a user, so every
+        # generated user shares one hash.
+        self.password = make_password(options["password"])
+        self.now = timezone.now()
+        self.totals = {User: 0, Album: 0, Song: 0}
+
+        if self.connection.vendor == "postgresql":
+            writer = self.copy_rows
+        else:
+            writer = self.insert_rows
+        started = time.perf_counter()
+
+        rows = self.generate(options["users"])
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            with transaction.atomic(using=self.using):
+                # Parents first, so the foreign keys of each batch resolve.
+                for model in (User, Album, Song):
+                    model_rows = [row for kind, row in batch if kind is model]
+                    if model_rows:
+                        writer(model, model_rows)
+                        self.totals[model] += len(model_rows)
+            self.report(started)
+
+        self.finish()
+        elapsed = time.perf_counter() - started
+        total = sum(self.totals.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s)."
+            )
+        )
+
+    def generate(self, users_count: int):
+        # Ids are assigned here so rows can be streamed without reading back
+        # what the database generated.
+        user_id, album_id, song_id = (
+            next_id(model, self.using) for model in (User, Album, Song)
+        )
+        rng = self.random
+
+        for _ in range(users_count):
+            artistic_name = self.title(rng.randint(1, 3))
+            yield User, {
+                "id": user_id,
+                "password": self.password,
+                "last_login": None,
+                "is_superuser": False,
+                "username": f"artist{user_id}",
+                "first_name": "",
+                "last_name": "",
+                "email": f"artist{user_id}@bandkamp.com",
+                "is_staff": False,
+                "is_active": True,
+                "date_joined": self.now,
+                "full_name": artistic_name,
+                "artistic_name": artistic_name,
+            }
+
+            for _ in range(rng.randint(*self.albums_per_user)):
+                yield Album, {
+                    "id": album_id,
+                    "name": self.title(rng.randint(1, 4)),
+                    "year": rng.randint(1960, self.now.year),
+                    "user_id": user_id,
+                }
+
+                for _ in range(rng.randint(*self.songs_per_album)):
+                    yield Song, {
+                        "id": song_id,
+                        "title": self.title(rng.randint(1, 5)),
+                        "duration": rng.randint(90, 420),
+                        "album_id": album_id,
+                    }
+                    song_id += 1
+                album_id += 1
+            user_id += 1
+
+    def title(self, words: int) -> str:
+        return " ".join(self.random.choices(WORDS, k=words)).title()
+
+    def columns(self, model):
+        return model._meta.concrete_fields
+
+    def prepared(self, model, rows):
+        connection = self.connection
+        # Columns the generator does not fill get their model default.
+        converters = [
+            (field.attname, field.get_default(), field.get_db_prep_save)
+            for field in self.columns(model)
+        ]
+        for row in rows:
+            yield [
+                prepare(row.get(attname, default), connection)
+                for attname, default, prepare in converters
+            ]
+
+    def insert_rows(self, model, rows):
+        fields = self.columns(model)
+        quote = self.connection.ops.quote_name
+        sql = "INSERT INTO %s (%s) VALUES (%s)" % (
+            quote(model._meta.db_table),
+            ", ".join(quote(field.column) for field in fields),
+            ", ".join(["%s"] * len(fields)),
+        )
+        with self.connection.cursor() as cursor:
+            cursor.executemany(sql, self.prepared(model, rows))
+
+    def copy_rows(self, model, rows):
+        fields = self.columns(model)
+        quote = self.connection.ops.quote_name
+        buffer = io.StringIO()
+        for values in self.prepared(model, rows):
+            buffer.write("\t".join(self.copy_value(value) for value in values))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        with self.connection.cursor() as cursor:
+            cursor.copy_expert(
+                "COPY %s (%s) FROM STDIN"
+                % (
+                    quote(model._meta.db_table),
+                    ", ".join(quote(field.column) for field in fields),
+                ),
+                buffer,
+            )
+
+    @staticmethod
+    def copy_value(value) -> str:
+        if value is None:
+            return "\\N"
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        return (
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+
+    def report(self, started: float):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{self.totals[User]} users, {self.totals[Album]} albums, "
+            f"{self.totals[Song]} songs ({elapsed:.1f}s)"
+        )
+
+    def finish(self):
+        # Explicit ids do not advance the Postgres sequences.
+        sequences = self.connection.ops.sequence_reset_sql(
+            no_style(), [User, Album, Song]
+        )
+        if sequences:
+            with self.connection.cursor() as cursor:
+                for sql in sequences:
+                    cursor.execute(sql)
+
+        # Raw inserts bypass the model signals that invalidate cached responses.
+        bump_generation(
+            User._meta.label_lower,
+            Album._meta.label_lower,
+            Song._meta.label_lower,
+            ALBUM_LIST_SCOPE,
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from bandkamp.warmup import STEPS, warm_up
+
+
+class Command(BaseCommand):
+    help = "Runs the worker warm-up phase and reports how long each step takes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "steps", nargs="*", help=f"any of {', '.join(STEPS)} (default: all)"
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options["steps"]) - set(STEPS)
+        if unknown:
+            raise CommandError(f"Unknown warm-up steps: {', '.join(sorted(unknown))}")
+
+        warm_up(options["steps"] or STEPS, report=self.stdout.write)
@@ -1,9 +1,31 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+class AlbumQuerySet(models.QuerySet):
+    def with_runtime(self):
+        # Correlated subqueries rather than a JOIN + GROUP BY, so the
+        # pagination COUNT(*) over this queryset does not have to aggregate.
+        from songs.models import Song
+
+        songs = Song.objects.filter(album=OuterRef("pk")).order_by().values("album")
+        return self.annotate(
+            track_count=Coalesce(
+                Subquery(songs.annotate(count=Count("id")).values("count")), 0
+            ),
+            total_duration=Coalesce(
+                Subquery(songs.annotate(total=Sum("duration")).values("total")), 0
+            ),
+        )
 
 
 class Album(models.Model):
     class Meta:
         ordering = ["id"]
+        indexes = [
+            models.Index(fields=["user", "id"], name="albums_album_user_id_idx"),
+        ]
 
     name = models.CharField(max_length=255)
     year = models.PositiveSmallIntegerField()
@@ -12,4 +34,8 @@ class Album(models.Model):
         "users.User",
         on_delete=models.CASCADE,
         related_name="albums",
+        # Covered by the composite index, which starts with this column.
+        db_index=False,
     )
+
+    objects = AlbumQuerySet.as_manager()
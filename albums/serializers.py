@@ -1,14 +1,37 @@
 from rest_framework import serializers
+from bandkamp.serializers import ChangedFieldsUpdateMixin
 from .models import Album
 from users.serializers import UserSerializer
+from songs.serializers import SongSerializer
 
 
-class AlbumSerializer(serializers.ModelSerializer):
+class AlbumListSerializer(serializers.ListSerializer):
+    def create(self, validated_data: list[dict]) -> list[Album]:
+        albums = [Album(**album_data) for album_data in validated_data]
+        return Album.objects.bulk_create(albums)
+
+
+class AlbumSerializer(ChangedFieldsUpdateMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
     class Meta:
         model = Album
         fields = "__all__"
+        list_serializer_class = AlbumListSerializer
 
     def create(self, validated_data):
         return Album.objects.create(**validated_data)
+
+
+class AlbumWithSongsSerializer(AlbumSerializer):
+    songs = SongSerializer(many=True, read_only=True)
+    track_count = serializers.IntegerField(read_only=True)
+    total_duration = serializers.IntegerField(
+        read_only=True, help_text="Total runtime of the album in seconds."
+    )
+
+
+class AlbumExportFilterSerializer(serializers.Serializer):
+    user = serializers.IntegerField(min_value=1, required=False)
+    after_id = serializers.IntegerField(min_value=0, required=False)
+    until_id = serializers.IntegerField(min_value=1, required=False)
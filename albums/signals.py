@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bandkamp.cache import ALBUM_LIST_SCOPE, album_scope, bump_generation_on_commit
+from .models import Album
+
+
+@receiver([post_save, post_delete], sender=Album)
+def bump_album_generations(sender, instance: Album, **kwargs):
+    scopes = [sender._meta.label_lower, ALBUM_LIST_SCOPE, album_scope(instance.pk)]
+    bump_generation_on_commit(*scopes, using=kwargs["using"])
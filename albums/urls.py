@@ -5,5 +5,7 @@ from songs import views as song_views
 
 urlpatterns = [
     path("albums/", views.AlbumView.as_view()),
+    path("albums/export/", views.AlbumExportView.as_view()),
+    path("albums/<int:pk>/", views.AlbumDetailView.as_view()),
     path("albums/<int:pk>/songs/", song_views.SongView.as_view()),
 ]
@@ -1,15 +1,229 @@
+from collections import defaultdict
+from typing import Iterator
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from .models import Album
-from .serializers import AlbumSerializer
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from .serializers import (
+    AlbumExportFilterSerializer,
+    AlbumSerializer,
+    AlbumWithSongsSerializer,
+)
+from songs.models import Song
+from songs.serializers import SongSerializer
+from users.authentication import CachedJWTAuthentication
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAcceptable
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
-from rest_framework.generics import ListCreateAPIView
+from rest_framework.generics import ListCreateAPIView, RetrieveAPIView
+from rest_framework.serializers import ListSerializer
+from rest_framework.views import APIView
+from drf_spectacular.utils import extend_schema
+from bandkamp.cache import (
+    ALBUM_LIST_SCOPE,
+    ConditionalGetMixin,
+    GenerationCacheMixin,
+    album_scope,
+    bump_generation,
+)
+from bandkamp.pagination import PaginationModeMixin
+from bandkamp.renderers import CSVRenderer, FastJSONRenderer, NDJSONRenderer
+from search import typeahead
 
 
-class AlbumView(ListCreateAPIView):
-    authentication_classes = [JWTAuthentication]
+class AlbumView(
+    ConditionalGetMixin,
+    GenerationCacheMixin,
+    PaginationModeMixin,
+    ListCreateAPIView,
+):
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticatedOrReadOnly]
-    queryset = Album.objects.all()
+    queryset = Album.objects.select_related("user").filter(
+        user__deletion_requested_at__isnull=True
+    )
     serializer_class = AlbumSerializer
 
+    # Maximum number of queries per request, independent of page size.
+    query_budget = {"GET": 2, "GET ?include=songs": 3, "POST": 2}
+
+    def includes_songs(self) -> bool:
+        include = self.request.query_params.get("include", "")
+        return "songs" in include.split(",")
+
+    def get_generation_scopes(self):
+        if self.includes_songs():
+            return [ALBUM_LIST_SCOPE, Song._meta.label_lower]
+        return [ALBUM_LIST_SCOPE]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.includes_songs():
+            queryset = queryset.with_runtime().prefetch_related(
+                Prefetch("songs", queryset=Song.objects.order_by("album_id", "id"))
+            )
+        return queryset
+
+    def get_serializer_class(self):
+        if self.request.method == "GET" and self.includes_songs():
+            return AlbumWithSongsSerializer
+        return super().get_serializer_class()
+
+    def get_serializer(self, *args, **kwargs):
+        # A JSON array creates every album of the batch in a single INSERT.
+        if isinstance(kwargs.get("data"), list):
+            kwargs["many"] = True
+            kwargs["allow_empty"] = False
+            kwargs["max_length"] = settings.ALBUM_BULK_CREATE_MAX_BATCH
+        return super().get_serializer(*args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+        # bulk_create does not send post_save, so invalidate here.
+        if isinstance(serializer, ListSerializer):
+            bump_generation(Album._meta.label_lower, ALBUM_LIST_SCOPE)
+            for album in serializer.instance:
+                typeahead.albums.add(album.pk, album.name)
+
+
+class AlbumDetailView(ConditionalGetMixin, RetrieveAPIView):
+    authentication_classes = [CachedJWTAuthentication]
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    queryset = (
+        Album.objects.select_related("user")
+        .filter(user__deletion_requested_at__isnull=True)
+        .with_runtime()
+        .prefetch_related(Prefetch("songs", queryset=Song.objects.order_by("album_id", "id")))
+    )
+    serializer_class = AlbumWithSongsSerializer
+
+    query_budget = {"GET": 2}
+
+    def get_generation_scopes(self):
+        # The owner is embedded too, and user writes only bump the list scope.
+        return [ALBUM_LIST_SCOPE, album_scope(self.kwargs["pk"])]
+
+
+class ExportUnavailable(APIException):
+    status_code = status.HTTP_501_NOT_IMPLEMENTED
+    default_detail = "Exports are only served by the WSGI workers."
+    default_code = "export_unavailable"
+
+
+class AlbumExportView(APIView):
+    """
+    Streams the whole catalog, one album with its owner and songs at a time.
+
+    Albums are read in keyset batches of `EXPORT_CHUNK_SIZE` ordered by id,
+    with the songs of each batch fetched in one extra query, so memory does
+    not grow with the catalog. `after_id`/`until_id` bound the id range so an
+    interrupted export can resume from the last album received.
+
+    Not served under ASGI: Django 4.0 iterates streaming responses on the event
+    loop, where the batch queries would raise `SynchronousOnlyOperation` after
+    the 200 has been sent, and it cannot stream from an async iterator.
+    """
+
+    authentication_classes = [CachedJWTAuthentication]
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    # JSON is only negotiated for error bodies; exports stream as NDJSON or CSV.
+    renderer_classes = [NDJSONRenderer, CSVRenderer, FastJSONRenderer]
+
+    csv_header = [
+        "album_id",
+        "album_name",
+        "album_year",
+        "user_id",
+        "username",
+        "artistic_name",
+        "song_id",
+        "song_title",
+        "song_duration",
+    ]
+
+    @extend_schema(parameters=[AlbumExportFilterSerializer], responses=AlbumSerializer)
+    def get(self, request):
+        if isinstance(request._request, ASGIRequest):
+            raise ExportUnavailable()
+
+        filters = AlbumExportFilterSerializer(data=request.query_params)
+        filters.is_valid(raise_exception=True)
+        albums = self.iter_albums(**filters.validated_data)
+
+        renderer = request.accepted_renderer
+        if not hasattr(renderer, "render_stream"):
+            raise NotAcceptable("Exports are available as NDJSON or CSV.")
+        if renderer.format == "csv":
+            rows = self.iter_csv_rows(albums)
+        else:
+            rows = albums
+
+        response = StreamingHttpResponse(
+            renderer.render_stream(rows),
+            content_type=f"{renderer.media_type}; charset={renderer.charset}",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="albums.{renderer.format}"'
+        )
+
+        return response
+
+    def handle_exception(self, exc):
+        response = super().handle_exception(exc)
+        # Errors are JSON objects whatever export format was asked for.
+        self.request.accepted_renderer = FastJSONRenderer()
+        self.request.accepted_media_type = FastJSONRenderer.media_type
+        return response
+
+    def iter_albums(self, user=None, after_id=0, until_id=None) -> Iterator[dict]:
+        queryset = (
+            Album.objects.select_related("user")
+            .filter(user__deletion_requested_at__isnull=True)
+            .order_by("id")
+        )
+        if user is not None:
+            queryset = queryset.filter(user_id=user)
+        if until_id is not None:
+            queryset = queryset.filter(id__lte=until_id)
+
+        album_serializer = AlbumSerializer()
+        song_serializer = SongSerializer()
+
+        while True:
+            albums = list(queryset.filter(id__gt=after_id)[: settings.EXPORT_CHUNK_SIZE])
+            if not albums:
+                return
+
+            songs_by_album = defaultdict(list)
+            songs = Song.objects.filter(album_id__in=[album.id for album in albums])
+            for song in songs.order_by("album_id", "id"):
+                songs_by_album[song.album_id].append(
+                    song_serializer.to_representation(song)
+                )
+
+            for album in albums:
+                data = album_serializer.to_representation(album)
+                data["songs"] = songs_by_album[album.id]
+                yield data
+
+            after_id = albums[-1].id
+
+    def iter_csv_rows(self, albums: Iterator[dict]) -> Iterator[list]:
+        yield self.csv_header
+
+        for album in albums:
+            album_row = [
+                album["id"],
+                album["name"],
+                album["year"],
+                album["user"]["id"],
+                album["user"]["username"],
+                album["user"]["artistic_name"],
+            ]
+            if not album["songs"]:
+                yield album_row + [None, None, None]
+            for song in album["songs"]:
+                yield album_row + [song["id"], song["title"], song["duration"]]
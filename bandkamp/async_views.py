@@ -0,0 +1,57 @@
+import functools
+import io
+from typing import Callable
+
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.views import exception_handler
+
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer
+
+
+def async_api_view(methods: list[str]) -> Callable:
+    """
+    Minimal DRF-like wrapper for coroutine views: restricts the HTTP methods,
+    parses JSON bodies into `request.data` and renders returned data and
+    `APIException`s the way the DRF views do.
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                detail = f'Method "{request.method}" not allowed.'
+                return render({"detail": detail}, status.HTTP_405_METHOD_NOT_ALLOWED)
+            try:
+                request.data = parse_json(request)
+                response = await view(request, *args, **kwargs)
+            except APIException as exc:
+                response = exception_handler(exc, {"request": request})
+                return render(response.data, response.status_code)
+
+            if isinstance(response, HttpResponse):
+                return response
+            return render(response)
+
+        # `csrf_exempt` only supports coroutine views from Django 5.0 on.
+        wrapper.csrf_exempt = True
+        return wrapper
+
+    return decorator
+
+
+def parse_json(request):
+    if not request.body:
+        return {}
+    return FastJSONParser().parse(io.BytesIO(request.body))
+
+
+def render(data, status_code: int = status.HTTP_200_OK) -> HttpResponse:
+    renderer = FastJSONRenderer()
+    return HttpResponse(
+        renderer.render(data),
+        status=status_code,
+        content_type=renderer.media_type,
+    )
@@ -0,0 +1,139 @@
+import functools
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .db.routers import reading_from_replica
+
+
+def _generation_key(scope: str) -> str:
+    return f"generation:{scope}"
+
+
+def get_generation(scope: str) -> int:
+    key = _generation_key(scope)
+    generation = cache.get(key)
+
+    if generation is None:
+        # Seeding from the clock keeps an evicted counter from restarting at a
+        # value that older cache entries were already keyed on.
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key, time.time_ns())
+
+    return generation
+
+
+def bump_generation(*scopes: str) -> None:
+    for scope in scopes:
+        key = _generation_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def bump_generation_on_commit(*scopes: str, using=None) -> None:
+    # Bumped only once the write is visible: a reader that cached the old rows
+    # under the new generation before the commit would keep serving them.
+    transaction.on_commit(functools.partial(bump_generation, *scopes), using=using)
+
+
+ALBUM_LIST_SCOPE = "albums"
+
+# Bumped when an account asks to be deleted, which hides its whole catalog: one
+# increment instead of one per album of the owner.
+OWNER_DELETIONS_SCOPE = "owner-deletions"
+
+
+def album_scope(album_id) -> str:
+    return f"album:{album_id}"
+
+
+def user_scope(user_id) -> str:
+    return f"user:{user_id}"
+
+
+class GenerationScopesMixin:
+    def get_generation_scopes(self) -> list[str]:
+        raise NotImplementedError(
+            f"{self.__class__.__name__} must implement `get_generation_scopes()`"
+        )
+
+    def get_generation_signature(self) -> str:
+        request = self.request
+        generations = ":".join(
+            str(get_generation(scope)) for scope in self.get_generation_scopes()
+        )
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        # Pagination links are absolute, so the host is part of the signature.
+        location = f"{request.get_host()}{request.path}?{query}"
+        digest = hashlib.md5(location.encode()).hexdigest()
+
+        return f"{generations}:{digest}"
+
+
+class GenerationCacheMixin(GenerationScopesMixin):
+    # Caches the serialized data of a list view until one of its generation
+    # scopes is bumped.
+    #
+    # The generations are part of the cache key, so invalidating every page of a
+    # listing is a single counter increment and old entries simply expire.
+
+    response_cache_timeout = None
+
+    def list(self, request, *args, **kwargs):
+        if not settings.SHARED_CACHE:
+            return super().list(request, *args, **kwargs)
+
+        key = f"response:{self.get_generation_signature()}"
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        # Generations are bumped when a write commits on the primary: a replica
+        # that has not applied it yet would cache the old rows under the new
+        # generation, and they would be served until the next write.
+        if not reading_from_replica():
+            timeout = self.response_cache_timeout or settings.RESPONSE_CACHE_TIMEOUT
+            cache.set(key, response.data, timeout)
+
+        return response
+
+
+class ConditionalGetMixin(GenerationScopesMixin):
+    # Answers GET requests whose `If-None-Match` matches the current ETag with
+    # 304 Not Modified, before any query or serialization happens.
+
+    def get_etag(self) -> str:
+        signature = self.get_generation_signature()
+        return '"%s"' % hashlib.md5(signature.encode()).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        # An ETag is only as good as the generation it was computed from, and a
+        # per-process generation never sees the writes of the other workers.
+        if not settings.SHARED_CACHE:
+            return super().get(request, *args, **kwargs)
+
+        etag = self.get_etag()
+
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().get(request, *args, **kwargs)
+            # Same as the response cache: rows read from a replica may predate
+            # the current generation, so they must not be tagged with it.
+            if reading_from_replica():
+                return response
+
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+
+        return response
@@ -0,0 +1,85 @@
+import hashlib
+import json
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import QuerySet
+
+from .cache import get_generation
+from .db.routers import reading_from_replica
+
+
+def _estimated_rows(queryset: QuerySet, connection) -> Optional[int]:
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    # Small results are exact for about the cost of the estimate, and that is
+    # where a wrong estimate shows the most.
+    rows = plan[0]["Plan"]["Plan Rows"]
+    if rows < settings.PAGINATION_APPROXIMATE_MIN_COUNT:
+        return None
+    return rows
+
+
+def _approximate_count(queryset: QuerySet) -> Optional[int]:
+    query = queryset.query
+    if query.distinct or query.is_sliced:
+        return None
+
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    # Filtered querysets (every listing hides the catalogs pending deletion)
+    # are estimated by the planner.
+    if query.where:
+        return _estimated_rows(queryset, connection)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+
+    # `reltuples` is -1 until the table has been vacuumed or analyzed.
+    if row is None or row[0] < 0:
+        return None
+
+    return row[0]
+
+
+def _count(queryset: QuerySet, mode: str) -> int:
+    count = None
+    if mode == "approximate":
+        count = _approximate_count(queryset)
+    if count is None:
+        count = queryset.count()
+    return count
+
+
+def get_count(queryset: QuerySet) -> int:
+    mode = settings.PAGINATION_COUNT_MODE
+    if not settings.SHARED_CACHE:
+        return _count(queryset, mode)
+
+    scope = queryset.model._meta.label_lower
+
+    sql, params = queryset.query.sql_with_params()
+    signature = hashlib.md5(f"{sql}{params}".encode()).hexdigest()
+    key = f"count:{scope}:{get_generation(scope)}:{mode}:{signature}"
+
+    count = cache.get(key)
+    if count is None:
+        count = _count(queryset, mode)
+        # Only counts read from the primary are as fresh as the generation.
+        if not reading_from_replica():
+            cache.set(key, count, settings.PAGINATION_COUNT_TIMEOUT)
+
+    return count
@@ -0,0 +1,114 @@
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+from bandkamp.db.pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# alias -> (connection parameters, pool opening connections with them)
+_pools: dict[str, tuple[dict, ConnectionPool]] = {}
+_pools_lock = threading.Lock()
+
+
+def pool_stats() -> dict[str, dict]:
+    return {alias: pool.stats() for alias, (_, pool) in _pools.items()}
+
+
+def close_pools() -> None:
+    with _pools_lock:
+        pools = [pool for _, pool in _pools.values()]
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+# Sockets must never be shared across a fork (e.g. a gunicorn master with
+# `preload_app`): the parent's pools are closed and the child opens its own.
+os.register_at_fork(before=close_pools)
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Makes a Django database backend check connections out of a per-process
+    `ConnectionPool` instead of opening one per request, and return them to
+    it instead of closing them. Configured by the `POOL` key of the database
+    settings (see `POSTGRES_POOL_*` in settings.py).
+    """
+
+    def get_pool(self, conn_params: dict) -> ConnectionPool:
+        # A pool only hands out connections opened with the current parameters:
+        # when they change (e.g. the test runner renaming NAME to the test
+        # database), the old pool is closed and replaced.
+        pooled = _pools.get(self.alias)
+        if pooled is not None and pooled[0] == conn_params:
+            return pooled[1]
+
+        with _pools_lock:
+            pooled = _pools.get(self.alias)
+            if pooled is not None and pooled[0] == conn_params:
+                return pooled[1]
+
+            options = {
+                key.lower(): value
+                for key, value in self.settings_dict.get("POOL", {}).items()
+            }
+            # The backends' `get_new_connection` only opens a connection from
+            # `conn_params`; the wrapper it is bound to does not matter.
+            new_connection = super().get_new_connection
+            pool = ConnectionPool(
+                lambda: new_connection(conn_params),
+                check=self.check_pooled_connection,
+                reset=self.reset_pooled_connection,
+                **options,
+            )
+            _pools[self.alias], stale = (conn_params, pool), pooled
+
+        if stale is not None:
+            # Checked out connections go back to the closed pool, which closes them.
+            stale[1].close()
+        return pool
+
+    def get_new_connection(self, conn_params: dict):
+        pool = self.get_pool(conn_params)
+        started = time.monotonic()
+        connection = pool.acquire()
+        self._pool = pool
+
+        waited_ms = (time.monotonic() - started) * 1000
+        if waited_ms > settings.DATABASE_POOL_SLOW_CHECKOUT_MS:
+            logger.warning(
+                "Waited %.1fms for a %r connection: %s",
+                waited_ms,
+                self.alias,
+                pool.stats(),
+            )
+
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        broken = bool(getattr(self.connection, "closed", False)) or (
+            self.errors_occurred and not self.is_usable()
+        )
+        with self.wrap_database_errors:
+            self._pool.release(self.connection, discard=broken)
+
+    @staticmethod
+    def check_pooled_connection(connection) -> bool:
+        cursor = connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        finally:
+            cursor.close()
+        return True
+
+    @staticmethod
+    def reset_pooled_connection(connection) -> None:
+        # Anything left open must not leak into the next checkout. Both
+        # psycopg2 and sqlite3 skip the round trip when no transaction is open.
+        connection.rollback()
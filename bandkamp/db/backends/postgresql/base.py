@@ -0,0 +1,13 @@
+from django.db.backends.postgresql import base
+
+from bandkamp.db.backends.pooling import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    def get_new_connection(self, conn_params: dict):
+        connection = super().get_new_connection(conn_params)
+        # Only set by Django when it opens the connection itself.
+        self.isolation_level = self.settings_dict["OPTIONS"].get(
+            "isolation_level", connection.isolation_level
+        )
+        return connection
@@ -0,0 +1,9 @@
+from django.db.backends.sqlite3 import base
+
+from bandkamp.db.backends.pooling import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    # Pooled SQLite, to exercise the pool locally. In-memory databases are
+    # never closed by Django, so this only makes sense with a database file.
+    pass
@@ -0,0 +1,106 @@
+import asyncio
+import hashlib
+import random
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+from bandkamp.db.routers import read_from
+
+PIN_COOKIE = "pin_primary"
+
+
+def pin_key(request) -> Optional[str]:
+    # API clients authenticate with a bearer token and rarely keep cookies, so
+    # they are pinned by (a digest of) their Authorization header.
+    authorization = request.headers.get("Authorization")
+    if not authorization:
+        return None
+    return "replica-pin:" + hashlib.sha256(authorization.encode()).hexdigest()
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Routes the reads of safe-method requests to a random replica from
+    `DATABASE_REPLICAS`, unless the client wrote within the last
+    `DATABASE_REPLICA_PIN_SECONDS`: a successful unsafe request pins it to the
+    primary for that window, both through a cookie and through the cache (keyed
+    by its Authorization header), so it never reads a replica that has not
+    caught up with its own writes yet. The cache pin only reaches the other
+    workers when the cache is shared (`SHARED_CACHE`); clients that drop the
+    cookie are otherwise only pinned on the worker that took their write.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Lets Django call the instance as a coroutine function.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        key = pin_key(request)
+        pinned = False
+        if request.method in SAFE_METHODS:
+            pinned = PIN_COOKIE in request.COOKIES or (
+                key is not None and cache.get(key) is not None
+            )
+
+        with read_from(*self.route(request, pinned)):
+            response = self.get_response(request)
+
+        if self.wrote(request, response):
+            if key is not None:
+                cache.set(key, True, settings.DATABASE_REPLICA_PIN_SECONDS)
+            self.set_pin_cookie(response)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        key = pin_key(request)
+        pinned = False
+        if request.method in SAFE_METHODS:
+            pinned = PIN_COOKIE in request.COOKIES or (
+                key is not None and await cache.aget(key) is not None
+            )
+
+        with read_from(*self.route(request, pinned)):
+            response = await self.get_response(request)
+
+        if self.wrote(request, response):
+            if key is not None:
+                await cache.aset(key, True, settings.DATABASE_REPLICA_PIN_SECONDS)
+            self.set_pin_cookie(response)
+        return response
+
+    @staticmethod
+    def route(request, pinned: bool) -> tuple[Optional[str], bool]:
+        if request.method not in SAFE_METHODS or pinned:
+            return None, pinned
+        return random.choice(settings.DATABASE_REPLICAS), False
+
+    @staticmethod
+    def wrote(request, response) -> bool:
+        return request.method not in SAFE_METHODS and response.status_code < 400
+
+    @staticmethod
+    def set_pin_cookie(response) -> None:
+        response.set_cookie(
+            PIN_COOKIE,
+            "1",
+            max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+            httponly=True,
+            samesite="Lax",
+        )
@@ -0,0 +1,252 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+from django.db import OperationalError
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(OperationalError):
+    # An OperationalError, so callers handling a database that cannot be
+    # reached handle an exhausted pool the same way.
+    pass
+
+
+class _Entry:
+    __slots__ = ("connection", "created_at", "last_used_at")
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = self.last_used_at = time.monotonic()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections.
+
+    - At most `max_size` connections exist at once; `acquire()` waits up to
+      `timeout` seconds for one to be released, then raises `PoolTimeout`.
+    - A connection idle for `check_interval` seconds or more is health checked
+      with `check(connection)` before being handed out, and replaced if broken.
+    - Connections idle for longer than `max_idle`, beyond the first `min_size`,
+      and connections older than `max_lifetime` are closed.
+    - `reset(connection)` runs on release, e.g. to roll back a transaction left
+      open; a connection whose reset fails is discarded.
+
+    `stats()` reports checkout counts and how long callers waited for one.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        *,
+        max_size: int = 10,
+        min_size: int = 0,
+        timeout: float = 30.0,
+        max_idle: float = 600.0,
+        max_lifetime: float = 3600.0,
+        check_interval: float = 30.0,
+        check: Optional[Callable[[Any], bool]] = None,
+        reset: Optional[Callable[[Any], None]] = None,
+        close: Callable[[Any], None] = lambda connection: connection.close(),
+    ):
+        if max_size < 1 or not 0 <= min_size <= max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size >= 1.")
+
+        self.connect = connect
+        self.max_size = max_size
+        self.min_size = min_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_interval = check_interval
+        self.check = check
+        self.reset = reset
+        self._close = close
+
+        self._cond = threading.Condition()
+        # Most recently used on the right, so `pop()` hands out warm connections
+        # and the ones idle the longest gather on the left to be evicted.
+        self._idle: deque[_Entry] = deque()
+        self._in_use: dict[int, _Entry] = {}
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._evicted = 0
+
+    def acquire(self, timeout: Optional[float] = None):
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            entry, expired = self._reserve(deadline)
+            self._close_all(expired)
+
+            if entry is None:
+                entry = self._open()
+            elif not self._healthy(entry):
+                self._discard(entry)
+                continue
+
+            waited = time.monotonic() - started
+            with self._cond:
+                self._in_use[id(entry.connection)] = entry
+                self._checkouts += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+            return entry.connection
+
+    def release(self, connection, discard: bool = False) -> None:
+        with self._cond:
+            entry = self._in_use.pop(id(connection), None)
+        if entry is None:
+            raise ValueError("Connection does not belong to this pool.")
+
+        if not discard and self.reset is not None:
+            try:
+                self.reset(connection)
+            except Exception:
+                logger.warning("Discarding a connection that failed to reset")
+                discard = True
+
+        now = time.monotonic()
+        with self._cond:
+            keep = not (discard or self._closed or self._too_old(entry, now))
+            if keep:
+                entry.last_used_at = now
+                self._idle.append(entry)
+            else:
+                self._size -= 1
+                self._discarded += discard
+            self._cond.notify()
+
+        if not keep:
+            self._close_all([entry])
+
+    def close(self) -> None:
+        # Idle connections are closed now, checked out ones when released.
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+        self._close_all(idle)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_total_ms": round(self._wait_total * 1000, 3),
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "discarded": self._discarded,
+                "evicted": self._evicted,
+            }
+
+    def _reserve(self, deadline: float) -> tuple[Optional[_Entry], list[_Entry]]:
+        # Returns an idle entry, or None after reserving room for a new
+        # connection, plus the expired entries to close outside the lock.
+        expired = []
+        with self._cond:
+            if self._closed:
+                raise PoolTimeout("The pool is closed.")
+
+            waited = False
+            while True:
+                expired += self._expire_locked()
+                if self._idle:
+                    return self._idle.pop(), expired
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, expired
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    break
+                if not waited:
+                    waited = True
+                    self._waits += 1
+                self._waiting += 1
+                self._cond.wait(remaining)
+                self._waiting -= 1
+
+        self._close_all(expired)
+        raise PoolTimeout(
+            f"No connection available within the timeout ({self.max_size} in use)."
+        )
+
+    def _expire_locked(self) -> list[_Entry]:
+        now = time.monotonic()
+        keep = deque()
+        expired = []
+        for entry in self._idle:
+            idle_for = now - entry.last_used_at
+            if self._too_old(entry, now) or (
+                idle_for > self.max_idle and self._size - len(expired) > self.min_size
+            ):
+                expired.append(entry)
+            else:
+                keep.append(entry)
+        self._idle = keep
+        self._size -= len(expired)
+        self._evicted += len(expired)
+        if expired:
+            self._cond.notify(len(expired))
+        return expired
+
+    def _too_old(self, entry: _Entry, now: float) -> bool:
+        return now - entry.created_at > self.max_lifetime
+
+    def _open(self) -> _Entry:
+        try:
+            entry = _Entry(self.connect())
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._created += 1
+        return entry
+
+    def _healthy(self, entry: _Entry) -> bool:
+        if self.check is None:
+            return True
+        if time.monotonic() - entry.last_used_at < self.check_interval:
+            return True
+        try:
+            return self.check(entry.connection)
+        except Exception:
+            return False
+
+    def _discard(self, entry: _Entry) -> None:
+        with self._cond:
+            self._size -= 1
+            self._discarded += 1
+            self._cond.notify()
+        self._close_all([entry])
+
+    def _close_all(self, entries: list[_Entry]) -> None:
+        for entry in entries:
+            try:
+                self._close(entry.connection)
+            except Exception:
+                logger.debug("Closing a pooled connection failed", exc_info=True)
@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# The replica the current request reads from. Unset outside of safe-method
+# requests, so writes, management commands and background threads always read
+# from the primary.
+_read_alias: ContextVar[Optional[str]] = ContextVar("read_alias", default=None)
+_pinned: ContextVar[bool] = ContextVar("pinned_to_primary", default=False)
+
+
+@contextmanager
+def read_from(alias: Optional[str], pinned: bool = False) -> Iterator[None]:
+    alias_token = _read_alias.set(alias)
+    pinned_token = _pinned.set(pinned)
+    try:
+        yield
+    finally:
+        _read_alias.reset(alias_token)
+        _pinned.reset(pinned_token)
+
+
+def is_pinned() -> bool:
+    # True while serving a client that wrote within the last
+    # DATABASE_REPLICA_PIN_SECONDS: what it reads must not come from a replica.
+    return _pinned.get()
+
+
+def reading_from_replica() -> bool:
+    # What is read from a replica may lag behind the cache generations, which
+    # are bumped as writes commit on the primary: it must not be cached under
+    # them.
+    return _read_alias.get() is not None
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of safe-method requests to the replica picked for them by
+    `ReplicaRoutingMiddleware`, and everything else to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
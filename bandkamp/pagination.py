@@ -0,0 +1,61 @@
+from django.core.paginator import Paginator
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+from .counts import get_count
+
+
+class CachedCountPaginator(Paginator):
+    @cached_property
+    def count(self) -> int:
+        if isinstance(self.object_list, QuerySet):
+            return get_count(self.object_list)
+        return super().count
+
+
+class CachedCountPageNumberPagination(PageNumberPagination):
+    django_paginator_class = CachedCountPaginator
+
+
+class KeysetPagination(CursorPagination):
+    # Album and Song are both ordered by primary key, so every page is a
+    # `WHERE id > <position> ORDER BY id LIMIT n` and no COUNT(*) is issued.
+    ordering = "id"
+
+
+class PaginationModeMixin:
+    # Lets a list view switch between page number and keyset pagination.
+    #
+    # The mode is chosen per view with `pagination_mode` and can be overridden
+    # per request with `?pagination=page|cursor`. Requests carrying a cursor
+    # always use keyset pagination so that `next`/`previous` links keep working.
+
+    pagination_mode = "page"
+    pagination_mode_query_param = "pagination"
+    keyset_pagination_class = KeysetPagination
+
+    def get_pagination_mode(self) -> str:
+        request = getattr(self, "request", None)
+        if request is None:
+            return self.pagination_mode
+
+        if KeysetPagination.cursor_query_param in request.query_params:
+            return "cursor"
+
+        mode = request.query_params.get(self.pagination_mode_query_param)
+        if mode in ("page", "cursor"):
+            return mode
+
+        return self.pagination_mode
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.get_pagination_mode() == "cursor":
+                self._paginator = self.keyset_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
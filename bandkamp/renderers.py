@@ -0,0 +1,146 @@
+import csv
+import decimal
+import json
+import re
+from typing import Iterable, Iterator
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Floats orjson formats differently from `repr()`: exponents ("1e16" for
+# "1e+16", "1e-7" for "1e-07"), the fixed notation it uses down to 1e-5, and
+# NaN and infinity, which it renders as null. The output is only a cheap hint
+# that the data may hold one (these also match inside strings); the floats
+# themselves are then checked.
+_ORJSON_EXPONENT = re.compile(rb"e[-+]?[0-9]")
+_ORJSON_FIXED_NOTATION = b"0.0000"
+_ORJSON_NULL = b"null"
+_SCALARS = {str, int, bool, type(None)}
+_LINE_SEPARATORS = {"\u2028".encode(): b"\\u2028", "\u2029".encode(): b"\\u2029"}
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` backed by orjson when it is installed, with the same bytes
+    as output. Whatever orjson would render differently (indented responses,
+    integers beyond 64 bits, floats that need an exponent) is left to
+    `JSONRenderer`. So are NaN and infinity, which orjson would render as
+    null: `JSONRenderer` raises on them under `STRICT_JSON`.
+    """
+
+    # Datetimes go through DRF's encoder, which trims them to milliseconds.
+    orjson_options = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        if orjson
+        else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default, option=self.orjson_options
+            )
+        except orjson.JSONEncodeError:
+            ret = None
+
+        if ret is None or (
+            self.may_hold_floats(ret) and _renders_floats_differently(data)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escaped by `JSONRenderer` for JavaScript, which treats them as newlines.
+        for separator, escaped in _LINE_SEPARATORS.items():
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+        return ret
+
+    @staticmethod
+    def may_hold_floats(ret: bytes) -> bool:
+        return (
+            _ORJSON_NULL in ret
+            or _ORJSON_FIXED_NOTATION in ret
+            or _ORJSON_EXPONENT.search(ret) is not None
+        )
+
+
+def _renders_floats_differently(data) -> bool:
+    # Whether any float (or Decimal, which DRF's encoder turns into one) is
+    # rendered by `repr()` in exponent notation or is not finite.
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if type(value) in _SCALARS:
+            continue
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, (float, decimal.Decimal)):
+            number = float(value)
+            if not (number == 0 or 1e-4 <= abs(number) < 1e16):
+                return True
+    return False
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return b"".join(self.render_stream(data if isinstance(data, list) else [data]))
+
+    def render_stream(self, objects: Iterable) -> Iterator[bytes]:
+        for obj in objects:
+            line = json.dumps(
+                obj, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")
+            )
+            yield f"{line}\n".encode(self.charset)
+
+
+class _LineBuffer:
+    def write(self, value: str) -> str:
+        return value
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renders rows as CSV. `render_stream` expects the header as its first row.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        objects = data if isinstance(data, list) else [data]
+        header = list(objects[0].keys()) if objects else []
+        rows = [header, *([obj.get(key) for key in header] for obj in objects)]
+
+        return b"".join(self.render_stream(rows))
+
+    def render_stream(self, rows: Iterable[list]) -> Iterator[bytes]:
+        writer = csv.writer(_LineBuffer())
+        for row in rows:
+            yield writer.writerow(row).encode(self.charset)
@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class ChangedFieldsUpdateMixin:
+    # `update()` for model serializers that only writes the columns whose value
+    # actually changed, via `save(update_fields=...)`, and skips the UPDATE
+    # (and the post_save signals) entirely when nothing did.
+
+    def update(self, instance: models.Model, validated_data: dict) -> models.Model:
+        changed_fields = self.set_changed_fields(instance, validated_data)
+        if changed_fields:
+            self.save_changed_fields(instance, changed_fields)
+
+        return instance
+
+    def set_changed_fields(
+        self, instance: models.Model, validated_data: dict
+    ) -> list[str]:
+        changed_fields = []
+        for attr, value in validated_data.items():
+            if getattr(instance, attr) != value:
+                setattr(instance, attr, value)
+                changed_fields.append(attr)
+
+        return changed_fields
+
+    def save_changed_fields(
+        self, instance: models.Model, changed_fields: list[str]
+    ) -> None:
+        instance.save(update_fields=changed_fields)
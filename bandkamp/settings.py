@@ -56,12 +56,14 @@ MY_APPS = [
     "users",
     "albums",
     "songs",
+    "search",
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + MY_APPS
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "bandkamp.db.middleware.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -115,11 +117,108 @@ if DATABASE_URL:
     DATABASES["default"].update(db_from_env)
     DEBUG = False
 
+# Comma separated read replica URLs. Safe-method requests read from one of them
+# (bandkamp/db/routers.py), unless the client wrote within the last
+# DATABASE_REPLICA_PIN_SECONDS; writes always go to the primary. The pin by
+# Authorization header lives in the cache, so without SHARED_CACHE it only holds
+# on the worker that took the write; the pin cookie holds everywhere.
+DATABASE_REPLICAS = []
+
+for number, url in enumerate(
+    filter(None, os.getenv("DATABASE_REPLICA_URLS", "").split(",")), start=1
+):
+    alias = f"replica_{number}"
+    DATABASES[alias] = dj_database_url.parse(
+        url.strip(),
+        conn_max_age=500,
+        ssl_require=True,
+        # Tests run against the primary only.
+        test_options={"MIRROR": "default"},
+    )
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["bandkamp.db.routers.ReplicaRouter"]
+
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DATABASE_REPLICA_PIN_SECONDS", 10))
+
+# Per-process connection pool for Postgres (bandkamp/db/pool.py): at most
+# POSTGRES_POOL_MAX_SIZE connections per worker, health checked after
+# POSTGRES_POOL_CHECK_INTERVAL idle seconds and closed after POSTGRES_POOL_MAX_IDLE.
+# Unset, Django keeps opening a connection per request (or per CONN_MAX_AGE).
+POSTGRES_POOL_MAX_SIZE = int(os.getenv("POSTGRES_POOL_MAX_SIZE", 0))
+
+for database in DATABASES.values():
+    if not POSTGRES_POOL_MAX_SIZE or not database["ENGINE"].endswith("postgresql"):
+        continue
+    database.update(
+        {
+            "ENGINE": "bandkamp.db.backends.postgresql",
+            # Connections go back to the pool at the end of every request.
+            "CONN_MAX_AGE": 0,
+            "POOL": {
+                "MAX_SIZE": POSTGRES_POOL_MAX_SIZE,
+                "MIN_SIZE": int(os.getenv("POSTGRES_POOL_MIN_SIZE", 0)),
+                "TIMEOUT": float(os.getenv("POSTGRES_POOL_TIMEOUT", 30)),
+                "MAX_IDLE": float(os.getenv("POSTGRES_POOL_MAX_IDLE", 600)),
+                "MAX_LIFETIME": float(os.getenv("POSTGRES_POOL_MAX_LIFETIME", 3600)),
+                "CHECK_INTERVAL": float(os.getenv("POSTGRES_POOL_CHECK_INTERVAL", 30)),
+            },
+        }
+    )
+
+# Pool checkouts slower than this are logged with the pool's stats.
+DATABASE_POOL_SLOW_CHECKOUT_MS = float(os.getenv("DATABASE_POOL_SLOW_CHECKOUT_MS", 100))
+
 if not DEBUG:
     STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
     STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+#
+# Generation counters must be shared by every worker for cached pages to be
+# invalidated everywhere, so production should point REDIS_URL at a server.
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+
+# Whether every worker sees the same cache. With the per-process default, a
+# write on one worker would not bump the generations of the others, which
+# would keep serving their cached pages and counts, and answering 304 to
+# their ETags; so those caches and ETags stay off.
+SHARED_CACHE = os.getenv("SHARED_CACHE", str(bool(REDIS_URL))).lower() == "true"
+
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 60))
+
+
+# Same algorithm as Django's default, with the key derivation run on a bounded
+# pool (users/hashing.py) so login bursts cannot starve the other endpoints.
+# It replaces PBKDF2PasswordHasher, which would otherwise take over verifying
+# the `pbkdf2_sha256` hashes.
+PASSWORD_HASHERS = [
+    "users.hashing.OffloadedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# Concurrent hashes per process, how many more may wait for a worker and for
+# how many seconds, before login/registration answer 503.
+PASSWORD_HASHING_WORKERS = int(
+    os.getenv("PASSWORD_HASHING_WORKERS", max(1, (os.cpu_count() or 2) // 2))
+)
+PASSWORD_HASHING_QUEUE_DEPTH = int(os.getenv("PASSWORD_HASHING_QUEUE_DEPTH", 64))
+PASSWORD_HASHING_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_HASHING_QUEUE_TIMEOUT", 5))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -144,11 +243,57 @@ SIMPLE_JWT = {
 }
 
 REST_FRAMEWORK = {
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "bandkamp.pagination.CachedCountPageNumberPagination",
     "PAGE_SIZE": 2,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # orjson-backed, with the same output as DRF's JSONRenderer/JSONParser.
+    "DEFAULT_RENDERER_CLASSES": [
+        "bandkamp.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "bandkamp.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
+# Page counts are cached per queryset (with SHARED_CACHE) until Album/Song
+# writes bump their generation. "approximate" serves planner estimates on
+# Postgres, counting exactly when the estimate is under
+# PAGINATION_APPROXIMATE_MIN_COUNT rows.
+PAGINATION_COUNT_MODE = os.getenv("PAGINATION_COUNT_MODE", "exact")
+PAGINATION_APPROXIMATE_MIN_COUNT = int(
+    os.getenv("PAGINATION_APPROXIMATE_MIN_COUNT", 1000)
+)
+PAGINATION_COUNT_TIMEOUT = int(os.getenv("PAGINATION_COUNT_TIMEOUT", 300))
+
+# Maximum number of albums accepted by a single bulk POST on /api/albums/.
+ALBUM_BULK_CREATE_MAX_BATCH = int(os.getenv("ALBUM_BULK_CREATE_MAX_BATCH", 1000))
+
+# Songs validated and inserted per batch by bulk imports on
+# /api/albums/<pk>/songs/ (JSON arrays and NDJSON streams).
+SONG_IMPORT_CHUNK_SIZE = int(os.getenv("SONG_IMPORT_CHUNK_SIZE", 500))
+
+# Albums read per batch by the streaming export on /api/albums/export/.
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))
+
+# Seconds before a worker rebuilds its typeahead index in the background to
+# pick up writes made by other processes.
+TYPEAHEAD_REBUILD_SECONDS = int(os.getenv("TYPEAHEAD_REBUILD_SECONDS", 300))
+
+# Songs/albums deleted per transaction when purging a deleted user's catalog.
+USER_PURGE_BATCH_SIZE = int(os.getenv("USER_PURGE_BATCH_SIZE", 1000))
+
+# Validated JWTs remembered per process by CachedJWTAuthentication, and for
+# how many seconds at most. A user's update or deactivation reaches the other
+# processes through the generation counters, which are only shared with a
+# shared cache (Redis); with the per-process default cache, a worker would keep
+# accepting the tokens of a user deactivated in another, so it stays off.
+JWT_AUTH_CACHE = os.getenv("JWT_AUTH_CACHE", str(bool(REDIS_URL))).lower() == "true"
+JWT_AUTH_CACHE_SIZE = int(os.getenv("JWT_AUTH_CACHE_SIZE", 10000))
+JWT_AUTH_CACHE_TIMEOUT = int(os.getenv("JWT_AUTH_CACHE_TIMEOUT", 300))
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.0/topics/i18n/
 
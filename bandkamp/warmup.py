@@ -0,0 +1,134 @@
+"""
+Builds everything the first requests of a fresh process would otherwise pay
+for: the URL resolver, serializer fields and model metadata, translation
+catalogs, drf-spectacular, database connections and the typeahead indexes.
+
+Run in the gunicorn master before forking (see gunicorn.conf.py) so workers
+inherit the result, or via `manage.py warmup` to see the startup report.
+"""
+import time
+from typing import Callable, Iterable, Optional
+
+from django.conf import settings
+from django.db import connections
+
+# Requests replayed in-process through the full middleware stack.
+WARM_UP_PATHS = [
+    "/api/albums/",
+    "/api/albums/?include=songs",
+    "/api/search/typeahead/?q=a",
+]
+
+
+def warm_urls() -> None:
+    from django.urls import get_resolver
+
+    resolver = get_resolver()
+    # Populating the reverse dict compiles every pattern of the URLconf.
+    resolver.reverse_dict
+    for path in WARM_UP_PATHS:
+        resolver.resolve(path.split("?")[0])
+
+
+def warm_serializers() -> None:
+    from rest_framework.settings import api_settings
+
+    from albums.serializers import AlbumSerializer, AlbumWithSongsSerializer
+    from songs.serializers import SongSerializer
+    from users.serializers import UserSerializer
+
+    for serializer_class in (
+        AlbumSerializer,
+        AlbumWithSongsSerializer,
+        SongSerializer,
+        UserSerializer,
+    ):
+        # Builds the fields from model metadata and loads the translation
+        # catalogs their error messages come from.
+        serializer_class().fields
+        serializer_class(data={}).is_valid()
+
+    for setting in (
+        "DEFAULT_RENDERER_CLASSES",
+        "DEFAULT_PARSER_CLASSES",
+        "DEFAULT_AUTHENTICATION_CLASSES",
+        "DEFAULT_PAGINATION_CLASS",
+        "DEFAULT_SCHEMA_CLASS",
+    ):
+        getattr(api_settings, setting)
+
+
+def warm_schema() -> None:
+    import drf_spectacular.openapi  # noqa: F401
+    import drf_spectacular.views  # noqa: F401
+
+
+def warm_database() -> None:
+    for connection in connections.all():
+        connection.ensure_connection()
+
+
+def warm_typeahead() -> None:
+    from search import typeahead
+
+    typeahead.warm_up()
+
+
+def warm_requests() -> None:
+    from django.test import Client
+
+    host = next(
+        (host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"),
+        "localhost",
+    )
+    client = Client(SERVER_NAME=host, raise_request_exception=False)
+    for path in WARM_UP_PATHS:
+        client.get(path)
+
+
+STEPS = {
+    "urls": warm_urls,
+    "serializers": warm_serializers,
+    "schema": warm_schema,
+    "database": warm_database,
+    "typeahead": warm_typeahead,
+    "requests": warm_requests,
+}
+
+
+def warm_up(
+    steps: Iterable[str] = STEPS,
+    report: Optional[Callable[[str], None]] = None,
+    close_connections: bool = False,
+    on_error: Optional[Callable[[str, Exception], None]] = None,
+) -> dict[str, float]:
+    """
+    Runs the given warm-up steps in order and returns how many seconds each
+    of the successful ones took. A failing step raises, unless `on_error` is
+    given: it is then called with the step and the exception, from within the
+    `except` block, and the next steps still run. `close_connections` drops
+    the connections opened along the way, which must not be shared with
+    forked workers, even when a step raised.
+    """
+    timings = {}
+    try:
+        for step in steps:
+            started = time.perf_counter()
+            try:
+                STEPS[step]()
+            except Exception as exc:
+                if on_error is None:
+                    raise
+                on_error(step, exc)
+                continue
+            timings[step] = time.perf_counter() - started
+            if report:
+                report(f"Warm-up {step}: {timings[step] * 1000:.1f}ms")
+    finally:
+        if close_connections:
+            connections.close_all()
+
+    if report:
+        report(f"Warm-up finished in {sum(timings.values()) * 1000:.1f}ms")
+
+    return timings
@@ -0,0 +1,127 @@
+"""
+Latency, queries per request and peak memory of every API endpoint at
+several catalog sizes.
+
+    python -m benchmarks.endpoints --sizes 1000 10000 100000 --output bench.json
+
+Each size is seeded with the `tests/factories` helpers into a fresh test
+database: `size` albums for one artist, plus `size` songs spread over the
+first albums in groups of `--songs-per-album`.
+"""
+import argparse
+
+from benchmarks.harness import (
+    measure,
+    print_table,
+    reset_database,
+    setup_django,
+    test_database,
+    write_report,
+)
+
+
+def seed(size: int, songs_per_album: int):
+    from tests.factories import (
+        create_multiple_albums_with_user,
+        create_multiple_songs_with_album,
+        create_user_with_token,
+    )
+
+    user, token = create_user_with_token()
+    albums = create_multiple_albums_with_user(user, size)
+    for album in albums[: max(1, size // songs_per_album)]:
+        create_multiple_songs_with_album(user, songs_per_album, album=album)
+
+    return user, token, albums
+
+
+def endpoints(user, token, albums) -> dict:
+    from rest_framework.test import APIClient
+
+    anonymous = APIClient()
+    authenticated = APIClient()
+    authenticated.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+    middle_page = max(1, len(albums) // 4)
+
+    def register(index):
+        return anonymous.post(
+            "/api/users/",
+            {
+                "username": f"bench_{index}",
+                "email": f"bench_{index}@kenziebuster.com",
+                "artistic_name": "Bench",
+                "password": "1234",
+            },
+            format="json",
+        )
+
+    return {
+        "GET /api/albums/": lambda index: anonymous.get("/api/albums/"),
+        "GET /api/albums/?page=deep": lambda index: anonymous.get(
+            "/api/albums/", {"page": middle_page}
+        ),
+        "GET /api/albums/?pagination=cursor": lambda index: anonymous.get(
+            "/api/albums/", {"pagination": "cursor"}
+        ),
+        "POST /api/albums/": lambda index: authenticated.post(
+            "/api/albums/", {"name": f"Bench {index}", "year": 2000}, format="json"
+        ),
+        "GET /api/albums/<pk>/songs/": lambda index: anonymous.get(
+            f"/api/albums/{albums[0].pk}/songs/"
+        ),
+        "POST /api/albums/<pk>/songs/": lambda index: authenticated.post(
+            f"/api/albums/{albums[0].pk}/songs/",
+            {"title": f"Bench {index}", "duration": "130"},
+            format="json",
+        ),
+        "POST /api/users/": lambda index: register(f"{index}"),
+        "GET /api/users/<pk>/": lambda index: anonymous.get(f"/api/users/{user.pk}/"),
+        "POST /api/users/login/": lambda index: anonymous.post(
+            "/api/users/login/",
+            {"username": user.username, "password": "1234"},
+            format="json",
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--songs-per-album", type=int, default=10)
+    parser.add_argument(
+        "--warm-cache",
+        action="store_true",
+        help="keep the response/count caches between requests (steady state)",
+    )
+    parser.add_argument("--keepdb", action="store_true")
+    parser.add_argument("--output", default="bench-endpoints.json")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+
+    before_each = None if args.warm_cache else cache.clear
+
+    results = []
+    with test_database(keepdb=args.keepdb):
+        for size in args.sizes:
+            reset_database()
+            cache.clear()
+            user, token, albums = seed(size, args.songs_per_album)
+
+            for name, request in endpoints(user, token, albums).items():
+                stats = measure(request, args.requests, before_each)
+                results.append({"size": size, "endpoint": name, **stats})
+                print(f"{size:>8}  {name}  p50={stats['p50_ms']}ms", flush=True)
+
+    print()
+    print_table(
+        results,
+        ["size", "endpoint", "p50_ms", "p90_ms", "p99_ms", "queries_per_request", "peak_memory_kb"],
+    )
+    write_report(args.output, "endpoints", results, warm_cache=args.warm_cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import json
+import os
+import statistics
+import subprocess
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable
+
+import django
+
+
+def setup_django() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "bandkamp.settings")
+    django.setup()
+
+
+@contextmanager
+def test_database(keepdb: bool = False):
+    """
+    Runs the benchmark against a throwaway `test_<NAME>` database built from
+    the migrations, exactly like the test suite does.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
+
+
+def reset_database() -> None:
+    from django.core.management import call_command
+
+    from search import typeahead
+
+    call_command("flush", interactive=False, verbosity=0)
+    typeahead.reset()
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    position = min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))
+    return ordered[position]
+
+
+def measure(
+    request: Callable[[int], object],
+    requests: int,
+    before_each: Callable[[], None] = None,
+) -> dict:
+    """
+    Calls `request(index)` `requests` times and reports latency percentiles
+    (ms), queries per request and the peak Python memory of one extra call.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    latencies, queries = [], []
+    for index in range(requests):
+        if before_each:
+            before_each()
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            request(index)
+            latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(len(context.captured_queries))
+
+    if before_each:
+        before_each()
+    tracemalloc.start()
+    request(requests)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "requests": requests,
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p90_ms": round(percentile(latencies, 0.90), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "queries_per_request": round(statistics.fmean(queries), 2),
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_report(path: str, benchmark: str, results: list[dict], **extra) -> None:
+    from django.db import connection
+
+    report = {
+        "benchmark": benchmark,
+        "commit": current_commit(),
+        "database": connection.vendor,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        **extra,
+        "results": results,
+    }
+    with open(path, "w") as output:
+        json.dump(report, output, indent=2)
+
+
+def print_table(results: list[dict], columns: list[str]) -> None:
+    widths = {
+        column: max(len(column), *(len(str(row[column])) for row in results))
+        for column in columns
+    }
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for row in results:
+        print("  ".join(str(row[column]).ljust(widths[column]) for column in columns))
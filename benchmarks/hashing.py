@@ -0,0 +1,140 @@
+"""
+Login throughput per core and album listing latency during a login burst,
+with PBKDF2 run inline in the request thread versus on the bounded hashing
+executor (users/hashing.py).
+
+    python -m benchmarks.hashing --logins 400 --concurrency 32 --output bench.json
+"""
+import argparse
+import os
+import threading
+import time
+
+from benchmarks.harness import (
+    percentile,
+    print_table,
+    reset_database,
+    setup_django,
+    test_database,
+    write_report,
+)
+
+MODES = {
+    "inline": ["django.contrib.auth.hashers.PBKDF2PasswordHasher"],
+    "offloaded": ["users.hashing.OffloadedPBKDF2PasswordHasher"],
+}
+
+
+def run_burst(user, logins: int, concurrency: int) -> dict:
+    from django.db import connection
+    from rest_framework.test import APIClient
+
+    statuses, album_latencies = [], []
+    remaining = iter(range(logins))
+    lock = threading.Lock()
+    burst_over = threading.Event()
+
+    def log_in():
+        client = APIClient()
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    break
+            response = client.post(
+                "/api/users/login/",
+                {"username": user.username, "password": "1234"},
+                format="json",
+            )
+            with lock:
+                statuses.append(response.status_code)
+        connection.close()
+
+    def list_albums():
+        client = APIClient()
+        index = 0
+        while not burst_over.is_set():
+            index += 1
+            start = time.perf_counter()
+            # A distinct query string per request skips the response cache.
+            client.get("/api/albums/", {"bench": index})
+            album_latencies.append((time.perf_counter() - start) * 1000)
+        connection.close()
+
+    lister = threading.Thread(target=list_albums)
+    workers = [threading.Thread(target=log_in) for _ in range(concurrency)]
+
+    started = time.perf_counter()
+    lister.start()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    burst_over.set()
+    lister.join()
+
+    succeeded = statuses.count(200)
+    cores = os.cpu_count() or 1
+    return {
+        "logins": len(statuses),
+        "succeeded": succeeded,
+        "rejected_503": statuses.count(503),
+        "logins_per_s": round(succeeded / elapsed, 1),
+        "logins_per_s_per_core": round(succeeded / elapsed / cores, 2),
+        "albums_requests": len(album_latencies),
+        "albums_p50_ms": round(percentile(album_latencies, 0.50), 3),
+        "albums_p99_ms": round(percentile(album_latencies, 0.99), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--albums", type=int, default=1000)
+    parser.add_argument("--output", default="bench-hashing.json")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.test import override_settings
+
+    from tests.factories import create_multiple_albums_with_user, create_user_with_token
+
+    results = []
+    with test_database():
+        reset_database()
+        user, _ = create_user_with_token()
+        create_multiple_albums_with_user(user, args.albums)
+
+        for mode, hashers in MODES.items():
+            with override_settings(PASSWORD_HASHERS=hashers):
+                stats = run_burst(user, args.logins, args.concurrency)
+            results.append({"mode": mode, **stats})
+            print(f"{mode}: {stats['logins_per_s']} logins/s", flush=True)
+
+    print()
+    print_table(
+        results,
+        [
+            "mode",
+            "succeeded",
+            "rejected_503",
+            "logins_per_s",
+            "logins_per_s_per_core",
+            "albums_p50_ms",
+            "albums_p99_ms",
+        ],
+    )
+    write_report(
+        args.output,
+        "hashing",
+        results,
+        cpu_count=os.cpu_count(),
+        concurrency=args.concurrency,
+        hashing_workers=settings.PASSWORD_HASHING_WORKERS,
+    )
+
+
+if __name__ == "__main__":
+    main()
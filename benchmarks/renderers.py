@@ -0,0 +1,93 @@
+"""
+Render time per /api/albums/ page (albums with their nested user) with DRF's
+JSONRenderer versus FastJSONRenderer, and parse time of the rendered page with
+JSONParser versus FastJSONParser.
+
+    python -m benchmarks.renderers --page-sizes 2 50 500 --repeat 500 --output bench.json
+"""
+import argparse
+import io
+import statistics
+import time
+
+from benchmarks.harness import (
+    percentile,
+    print_table,
+    reset_database,
+    setup_django,
+    test_database,
+    write_report,
+)
+
+
+def timings(function, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return {
+        "p50_us": round(percentile(samples, 0.50), 1),
+        "p99_us": round(percentile(samples, 0.99), 1),
+        "mean_us": round(statistics.fmean(samples), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[2, 50, 500])
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--output", default="bench-json.json")
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from albums.models import Album
+    from albums.serializers import AlbumSerializer
+    from bandkamp.parsers import FastJSONParser
+    from bandkamp.renderers import FastJSONRenderer, orjson
+    from tests.factories import create_multiple_albums_with_user, create_user_with_token
+
+    renderers = {"JSONRenderer": JSONRenderer(), "FastJSONRenderer": FastJSONRenderer()}
+    parsers = {"JSONParser": JSONParser(), "FastJSONParser": FastJSONParser()}
+
+    results = []
+    with test_database():
+        reset_database()
+        user, _ = create_user_with_token()
+        create_multiple_albums_with_user(user, max(args.page_sizes))
+
+        for page_size in args.page_sizes:
+            albums = Album.objects.select_related("user").order_by("id")[:page_size]
+            page = {
+                "count": page_size,
+                "next": "http://testserver/api/albums/?page=2",
+                "previous": None,
+                "results": AlbumSerializer(albums, many=True).data,
+            }
+            body = JSONRenderer().render(page)
+
+            for name, renderer in renderers.items():
+                stats = timings(lambda: renderer.render(page), args.repeat)
+                results.append({"page_size": page_size, "codec": name, **stats})
+            for name, json_parser in parsers.items():
+                stats = timings(
+                    lambda: json_parser.parse(io.BytesIO(body), parser_context={}),
+                    args.repeat,
+                )
+                results.append({"page_size": page_size, "codec": name, **stats})
+
+    print_table(results, ["page_size", "codec", "p50_us", "p99_us", "mean_us"])
+    write_report(
+        args.output,
+        "json",
+        results,
+        orjson=orjson.__version__ if orjson else None,
+        repeat=args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# Picked up automatically by `gunicorn bandkamp.wsgi` from the project root.
+#
+# The application is loaded and warmed up once in the master, so every worker
+# forked from it starts with compiled URLs, built serializers and the typeahead
+# indexes instead of paying for them on its first requests.
+#
+# Warming up is only an optimization: a failing step (the database being down,
+# say) is logged and skipped, never allowed to kill the arbiter or a worker.
+
+preload_app = True
+
+
+def _log_failure(log):
+    def on_error(step, exc):
+        log.exception("Warm-up %s failed, skipping it: %s", step, exc)
+
+    return on_error
+
+
+def when_ready(server):
+    from bandkamp.warmup import warm_up
+
+    # Sockets and connections must not cross the fork.
+    warm_up(
+        report=server.log.info,
+        close_connections=True,
+        on_error=_log_failure(server.log),
+    )
+
+
+def post_worker_init(worker):
+    from bandkamp.warmup import warm_up
+
+    warm_up(
+        steps=["database"],
+        report=worker.log.info,
+        on_error=_log_failure(worker.log),
+    )
+
+
+def worker_exit(server, worker):
+    from bandkamp.db.backends.pooling import pool_stats
+
+    for alias, stats in pool_stats().items():
+        worker.log.info("Connection pool %r: %s", alias, stats)
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .indexes import ensure_sqlite_search_tables
+
+        post_migrate.connect(ensure_sqlite_search_tables, sender=self)
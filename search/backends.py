@@ -0,0 +1,64 @@
+import re
+
+from django.db import connections
+from django.db.models import FloatField, QuerySet, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+
+from .indexes import SEARCH_CONFIG
+
+
+def search_terms(text: str) -> list[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+def _postgres_search(queryset: QuerySet, column: str, text: str) -> QuerySet:
+    from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+    vector = SearchVector(column, config=SEARCH_CONFIG)
+    query = SearchQuery(" ".join(search_terms(text)), config=SEARCH_CONFIG)
+
+    # Plain ts_rank ignores the length of the document, so a title that only
+    # mentions the terms would tie with one made of them; normalization 1
+    # divides by 1 + log(length), as bm25() does on SQLite. ts_rank returns a
+    # float4; as float8 the cursor position round-trips.
+    rank = SearchRank(vector, query, normalization=Value(1))
+    return (
+        queryset.alias(search_vector=vector)
+        .filter(search_vector=query)
+        .annotate(rank=Cast(rank, FloatField()))
+    )
+
+
+def _sqlite_search(queryset: QuerySet, column: str, text: str) -> QuerySet:
+    table = queryset.model._meta.db_table
+    fts = f"{table}_fts"
+    match = " ".join(f'"{term}"' for term in search_terms(text))
+
+    matches = RawSQL(f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", (match,))
+    # bm25() is lower for better matches, so it is negated to sort like ts_rank.
+    rank = RawSQL(
+        f"SELECT -bm25({fts}) FROM {fts} WHERE {fts} MATCH %s AND rowid = {table}.id",
+        (match,),
+        output_field=FloatField(),
+    )
+
+    return queryset.filter(id__in=matches).annotate(rank=rank)
+
+
+def full_text_search(queryset: QuerySet, column: str, text: str) -> QuerySet:
+    """
+    Filters `queryset` to rows whose `column` matches every term of `text`,
+    annotated with a `rank` where higher is a better match.
+    """
+    if not search_terms(text):
+        return queryset.none().annotate(rank=Value(0.0, output_field=FloatField()))
+
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        return _postgres_search(queryset, column, text)
+    if vendor == "sqlite":
+        return _sqlite_search(queryset, column, text)
+
+    queryset = queryset.filter(**{f"{column}__icontains": text})
+    return queryset.annotate(rank=Value(0.0, output_field=FloatField()))
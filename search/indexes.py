@@ -0,0 +1,87 @@
+from django.db import connections
+
+SEARCH_CONFIG = "simple"
+
+# (table, column) pairs covered by full-text search.
+SEARCHABLE_COLUMNS = [
+    ("albums_album", "name"),
+    ("songs_song", "title"),
+    ("users_user", "artistic_name"),
+]
+
+
+def _postgres_index_name(table: str, column: str) -> str:
+    return f"{table}_{column}_search_idx"
+
+
+def create_postgres_search_indexes(apps, schema_editor):
+    # Expression indexes matching `SearchVector(column, config=SEARCH_CONFIG)`
+    # exactly, so the planner can use them for `@@` lookups.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for table, column in SEARCHABLE_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{_postgres_index_name(table, column)}" '
+            f'ON "{table}" USING gin '
+            f"(to_tsvector('{SEARCH_CONFIG}'::regconfig, COALESCE(\"{column}\", '')))"
+        )
+
+
+def drop_postgres_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for table, column in SEARCHABLE_COLUMNS:
+        schema_editor.execute(
+            f'DROP INDEX IF EXISTS "{_postgres_index_name(table, column)}"'
+        )
+
+
+def ensure_sqlite_search_tables(using="default", **kwargs):
+    """
+    Creates the FTS5 tables and sync triggers used on SQLite.
+
+    Runs after every `migrate` rather than inside a migration because SQLite
+    rebuilds a table on most schema changes, which silently drops its
+    triggers. Missing triggers are recreated and the index is rebuilt.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        existing_triggers = {row[0] for row in cursor.fetchall()}
+
+        for table, column in SEARCHABLE_COLUMNS:
+            fts = f"{table}_fts"
+            triggers = {
+                f"{fts}_ai": (
+                    f"AFTER INSERT ON {table} BEGIN "
+                    f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END"
+                ),
+                f"{fts}_ad": (
+                    f"AFTER DELETE ON {table} BEGIN "
+                    f"INSERT INTO {fts}({fts}, rowid, {column}) "
+                    f"VALUES ('delete', old.id, old.{column}); END"
+                ),
+                f"{fts}_au": (
+                    f"AFTER UPDATE OF {column} ON {table} BEGIN "
+                    f"INSERT INTO {fts}({fts}, rowid, {column}) "
+                    f"VALUES ('delete', old.id, old.{column}); "
+                    f"INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END"
+                ),
+            }
+
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} "
+                f"USING fts5({column}, content='{table}', content_rowid='id')"
+            )
+
+            missing = [name for name in triggers if name not in existing_triggers]
+            for name in missing:
+                cursor.execute(f"CREATE TRIGGER {name} {triggers[name]}")
+
+            if missing:
+                cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
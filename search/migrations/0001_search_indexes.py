@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from search.indexes import (
+    create_postgres_search_indexes,
+    drop_postgres_search_indexes,
+)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('albums', '0002_initial'),
+        ('songs', '0002_song_duration_seconds'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_postgres_search_indexes, drop_postgres_search_indexes
+        ),
+    ]
@@ -0,0 +1,2 @@
+# The search app has no models of its own: it indexes columns of
+# albums_album, songs_song and users_user (see `search.indexes`).
@@ -0,0 +1,51 @@
+from rest_framework import serializers
+
+from albums.serializers import AlbumSerializer
+from songs.serializers import SongSerializer
+from users.models import User
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=255)
+    type = serializers.ChoiceField(
+        choices=["albums", "songs", "artists"], default="albums"
+    )
+
+
+class TypeaheadQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class TypeaheadArtistSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    artistic_name = serializers.CharField()
+
+
+class TypeaheadAlbumSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+
+
+class TypeaheadSerializer(serializers.Serializer):
+    artists = TypeaheadArtistSerializer(many=True)
+    albums = TypeaheadAlbumSerializer(many=True)
+
+
+class AlbumSearchSerializer(AlbumSerializer):
+    rank = serializers.FloatField(read_only=True)
+
+
+class SongSearchSerializer(SongSerializer):
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta(SongSerializer.Meta):
+        fields = [*SongSerializer.Meta.fields, "rank"]
+
+
+class ArtistSearchSerializer(serializers.ModelSerializer):
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = User
+        fields = ["id", "username", "artistic_name", "rank"]
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from albums.models import Album
+from users.models import User
+from . import typeahead
+
+
+@receiver(post_save, sender=Album)
+def index_album(sender, instance: Album, **kwargs):
+    typeahead.albums.add(instance.pk, instance.name)
+
+
+@receiver(post_delete, sender=Album)
+def unindex_album(sender, instance: Album, **kwargs):
+    typeahead.albums.remove(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def index_artist(sender, instance: User, **kwargs):
+    if instance.is_active:
+        typeahead.artists.add(instance.pk, instance.artistic_name)
+    else:
+        typeahead.artists.remove(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def unindex_artist(sender, instance: User, **kwargs):
+    typeahead.artists.remove(instance.pk)
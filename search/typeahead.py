@@ -0,0 +1,152 @@
+import bisect
+import threading
+import time
+import unicodedata
+from typing import Callable, Iterable, Optional
+
+from django.conf import settings
+from django.db import connection
+
+
+def normalize(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class PrefixIndex:
+    """
+    Sorted-array prefix index over `(id, text)` pairs.
+
+    Every word start of a text is indexed, so "coll" completes
+    "Shadows Collide with People". Lookups are a binary search followed by a
+    short scan; updates are an insertion into the sorted array.
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[tuple[int, str]]]):
+        self.loader = loader
+        self.built_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self._rebuilding = False
+        self._keys: list[tuple[str, int]] = []
+        self._texts: dict[int, str] = {}
+
+    @staticmethod
+    def _keys_for(text: str) -> set[str]:
+        words = normalize(text).split()
+        return {" ".join(words[start:]) for start in range(len(words))}
+
+    def build(self) -> None:
+        texts = dict(self.loader())
+        keys = sorted(
+            (key, pk) for pk, text in texts.items() for key in self._keys_for(text)
+        )
+        with self._lock:
+            self._keys, self._texts = keys, texts
+            self.built_at = time.monotonic()
+
+    def ensure_built(self) -> None:
+        with self._lock:
+            if self.built_at is None:
+                self.build()
+                return
+
+            expired = time.monotonic() - self.built_at > settings.TYPEAHEAD_REBUILD_SECONDS
+            if not expired or self._rebuilding:
+                return
+            self._rebuilding = True
+
+        # Writes made by other processes only reach this index through a
+        # rebuild, done in the background while the current one keeps serving.
+        threading.Thread(target=self._rebuild_in_background, daemon=True).start()
+
+    def _rebuild_in_background(self) -> None:
+        try:
+            self.build()
+        finally:
+            self._rebuilding = False
+            connection.close()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._keys, self._texts = [], {}
+            self.built_at = None
+
+    def add(self, pk: int, text: str) -> None:
+        with self._lock:
+            if self.built_at is None:
+                return
+            self._discard(pk)
+            self._texts[pk] = text
+            for key in self._keys_for(text):
+                bisect.insort(self._keys, (key, pk))
+
+    def remove(self, pk: int) -> None:
+        with self._lock:
+            if self.built_at is not None:
+                self._discard(pk)
+
+    def remove_many(self, pks: Iterable[int]) -> None:
+        # One pass over the keys for the whole batch, where `remove` shifts the
+        # array once per key.
+        with self._lock:
+            if self.built_at is None:
+                return
+            pks = {pk for pk in pks if self._texts.pop(pk, None) is not None}
+            if pks:
+                self._keys = [entry for entry in self._keys if entry[1] not in pks]
+
+    def _discard(self, pk: int) -> None:
+        text = self._texts.pop(pk, None)
+        if text is None:
+            return
+        for key in self._keys_for(text):
+            position = bisect.bisect_left(self._keys, (key, pk))
+            if position < len(self._keys) and self._keys[position] == (key, pk):
+                del self._keys[position]
+
+    def complete(self, prefix: str, limit: int) -> list[tuple[int, str]]:
+        prefix = normalize(prefix).strip()
+        if not prefix:
+            return []
+
+        self.ensure_built()
+
+        results = {}
+        with self._lock:
+            position = bisect.bisect_left(self._keys, (prefix,))
+            while position < len(self._keys) and len(results) < limit:
+                key, pk = self._keys[position]
+                if not key.startswith(prefix):
+                    break
+                results.setdefault(pk, self._texts[pk])
+                position += 1
+
+        return list(results.items())
+
+
+def _load_artists():
+    from users.models import User
+
+    artists = User.objects.filter(is_active=True, deletion_requested_at__isnull=True)
+    return artists.values_list("id", "artistic_name").iterator(chunk_size=5000)
+
+
+def _load_albums():
+    from albums.models import Album
+
+    albums = Album.objects.filter(user__deletion_requested_at__isnull=True)
+    return albums.values_list("id", "name").iterator(chunk_size=5000)
+
+
+artists = PrefixIndex(_load_artists)
+albums = PrefixIndex(_load_albums)
+
+
+def warm_up() -> None:
+    artists.build()
+    albums.build()
+
+
+def reset() -> None:
+    artists.reset()
+    albums.reset()
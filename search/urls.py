@@ -0,0 +1,8 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path("search/", views.SearchView.as_view()),
+    path("search/typeahead/", views.TypeaheadView.as_view()),
+]
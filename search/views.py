@@ -0,0 +1,92 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework.generics import ListAPIView
+from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from users.authentication import CachedJWTAuthentication
+
+from albums.models import Album
+from bandkamp.pagination import KeysetPagination
+from songs.models import Song
+from users.models import User
+from . import typeahead
+from .backends import full_text_search
+from .serializers import (
+    AlbumSearchSerializer,
+    ArtistSearchSerializer,
+    SearchQuerySerializer,
+    SongSearchSerializer,
+    TypeaheadQuerySerializer,
+    TypeaheadSerializer,
+)
+
+
+class SearchPagination(KeysetPagination):
+    ordering = ("-rank", "id")
+
+
+class SearchView(ListAPIView):
+    authentication_classes = [CachedJWTAuthentication]
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = SearchPagination
+
+    # type -> (column searched, serializer)
+    targets = {
+        "albums": ("name", AlbumSearchSerializer),
+        "songs": ("title", SongSearchSerializer),
+        "artists": ("artistic_name", ArtistSearchSerializer),
+    }
+
+    search_params = {"q": "", "type": "albums"}
+
+    @extend_schema(parameters=[SearchQuerySerializer])
+    def get(self, request, *args, **kwargs):
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        self.search_params = params.validated_data
+
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        target = self.search_params["type"]
+        if target == "albums":
+            queryset = Album.objects.select_related("user").filter(
+                user__deletion_requested_at__isnull=True
+            )
+        elif target == "songs":
+            queryset = Song.objects.filter(album__user__deletion_requested_at__isnull=True)
+        else:
+            queryset = User.objects.filter(is_active=True, deletion_requested_at__isnull=True)
+
+        column, _ = self.targets[target]
+        return full_text_search(queryset, column, self.search_params["q"])
+
+    def get_serializer_class(self):
+        _, serializer_class = self.targets[self.search_params["type"]]
+        return serializer_class
+
+
+class TypeaheadView(APIView):
+    # Served from the in-process prefix indexes in `search.typeahead`, so a
+    # keystroke costs no database query.
+    authentication_classes = []
+    permission_classes = []
+
+    @extend_schema(parameters=[TypeaheadQuerySerializer], responses=TypeaheadSerializer)
+    def get(self, request):
+        params = TypeaheadQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        prefix, limit = params.validated_data["q"], params.validated_data["limit"]
+
+        return Response(
+            {
+                "artists": [
+                    {"id": pk, "artistic_name": text}
+                    for pk, text in typeahead.artists.complete(prefix, limit)
+                ],
+                "albums": [
+                    {"id": pk, "name": text}
+                    for pk, text in typeahead.albums.complete(prefix, limit)
+                ],
+            }
+        )
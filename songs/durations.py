@@ -0,0 +1,60 @@
+import re
+
+_UNITS = {
+    "h": 3600,
+    "hr": 3600,
+    "hour": 3600,
+    "hours": 3600,
+    "m": 60,
+    "min": 60,
+    "mins": 60,
+    "minute": 60,
+    "minutes": 60,
+    "s": 1,
+    "sec": 1,
+    "secs": 1,
+    "second": 1,
+    "seconds": 1,
+}
+
+# Largest value a PositiveIntegerField column holds on every backend.
+MAX_DURATION_SECONDS = 2_147_483_647
+
+_CLOCK = re.compile(r"^(?:(\d+):)?(\d+):(\d{1,2})$")
+_UNIT_PART = re.compile(r"(\d+)\s*([a-z]+)")
+
+
+def parse_duration(value) -> int:
+    """
+    Converts a song duration to seconds.
+
+    Accepts plain seconds ("130", 130), clock notation ("2:10", "1:02:10") and
+    unit suffixes ("110min", "1h 30min", "90s"). Raises `ValueError` otherwise.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid duration: {value!r}")
+    if isinstance(value, int):
+        if value < 0:
+            raise ValueError(f"Invalid duration: {value!r}")
+        return value
+
+    text = str(value).strip().lower()
+    if text.isdigit():
+        return int(text)
+
+    clock = _CLOCK.match(text)
+    if clock:
+        hours, minutes, seconds = clock.groups()
+        return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+
+    parts = _UNIT_PART.findall(text)
+    if not parts or _UNIT_PART.sub("", text).strip():
+        raise ValueError(f"Invalid duration: {value!r}")
+
+    total = 0
+    for amount, unit in parts:
+        if unit not in _UNITS:
+            raise ValueError(f"Invalid duration: {value!r}")
+        total += int(amount) * _UNITS[unit]
+
+    return total
@@ -0,0 +1,46 @@
+from django.core.exceptions import ValidationError
+from django.db import models
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+
+from .durations import MAX_DURATION_SECONDS, parse_duration
+
+
+class DurationSecondsField(models.PositiveIntegerField):
+    # Stored as integer seconds, but still accepts the textual durations
+    # ("110min", "2:10") the column used to hold.
+    def to_python(self, value):
+        if not isinstance(value, str):
+            return super().to_python(value)
+        try:
+            return parse_duration(value)
+        except ValueError:
+            raise ValidationError(
+                self.error_messages["invalid"], code="invalid", params={"value": value}
+            )
+
+    def get_prep_value(self, value):
+        if isinstance(value, str):
+            value = parse_duration(value)
+        return super().get_prep_value(value)
+
+
+@extend_schema_field(OpenApiTypes.STR)
+class SongDurationField(serializers.Field):
+    default_error_messages = {
+        "invalid": 'Invalid duration. Use seconds ("130"), "2:10" or "110min".',
+        "max_value": "Ensure this duration is at most {max_value} seconds.",
+    }
+
+    def to_internal_value(self, data) -> int:
+        try:
+            seconds = parse_duration(data)
+        except ValueError:
+            self.fail("invalid")
+        if seconds > MAX_DURATION_SECONDS:
+            self.fail("max_value", max_value=MAX_DURATION_SECONDS)
+        return seconds
+
+    def to_representation(self, value) -> str:
+        return str(value)
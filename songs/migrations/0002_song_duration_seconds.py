@@ -0,0 +1,75 @@
+from django.db import migrations, models
+
+import songs.fields
+from songs.durations import MAX_DURATION_SECONDS, parse_duration
+
+
+def durations_to_seconds(apps, schema_editor):
+    Song = apps.get_model("songs", "Song")
+    songs = Song.objects.using(schema_editor.connection.alias).only("id", "duration")
+
+    batch = []
+    invalid = []
+    for song in songs.iterator(chunk_size=2000):
+        try:
+            song.duration_seconds = parse_duration(song.duration)
+        except ValueError:
+            invalid.append((song.id, song.duration))
+            continue
+        if song.duration_seconds > MAX_DURATION_SECONDS:
+            invalid.append((song.id, song.duration))
+            continue
+        batch.append(song)
+
+        if len(batch) == 2000:
+            Song.objects.bulk_update(batch, ["duration_seconds"])
+            batch = []
+
+    # Refuse to guess: the migration runs in a transaction, so fixing the
+    # listed rows and migrating again loses nothing.
+    if invalid:
+        listed = ", ".join(f"{pk}: {duration!r}" for pk, duration in invalid[:50])
+        more = f" (and {len(invalid) - 50} more)" if len(invalid) > 50 else ""
+        raise ValueError(
+            f"{len(invalid)} song durations cannot be converted to seconds, "
+            f"fix them and migrate again. Song id: duration - {listed}{more}"
+        )
+
+    Song.objects.bulk_update(batch, ["duration_seconds"])
+
+
+def seconds_to_durations(apps, schema_editor):
+    Song = apps.get_model("songs", "Song")
+    Song.objects.using(schema_editor.connection.alias).update(
+        duration=models.functions.Cast("duration_seconds", models.CharField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('songs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='song',
+            name='duration_seconds',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(durations_to_seconds, seconds_to_durations),
+        migrations.RemoveField(
+            model_name='song',
+            name='duration',
+        ),
+        migrations.RenameField(
+            model_name='song',
+            old_name='duration_seconds',
+            new_name='duration',
+        ),
+        migrations.AlterField(
+            model_name='song',
+            name='duration',
+            field=songs.fields.DurationSecondsField(),
+        ),
+    ]
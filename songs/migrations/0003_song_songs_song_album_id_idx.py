@@ -0,0 +1,23 @@
+# Generated by Django 4.0.7 on 2026-10-18 13:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('songs', '0002_song_duration_seconds'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='song',
+            index=models.Index(fields=['album', 'id'], name='songs_song_album_id_idx'),
+        ),
+        migrations.AlterField(
+            model_name='song',
+            name='album',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='songs', to='albums.album'),
+        ),
+    ]
@@ -1,15 +1,22 @@
 from django.db import models
 
+from .fields import DurationSecondsField
+
 
 class Song(models.Model):
     class Meta:
         ordering = ("id",)
+        indexes = [
+            models.Index(fields=["album", "id"], name="songs_song_album_id_idx"),
+        ]
 
     title = models.CharField(max_length=255)
-    duration = models.CharField(max_length=255)
+    duration = DurationSecondsField()
 
     album = models.ForeignKey(
         "albums.Album",
         on_delete=models.CASCADE,
         related_name="songs",
+        # Covered by the composite index, which starts with this column.
+        db_index=False,
     )
@@ -1,12 +1,26 @@
+from django.conf import settings
 from rest_framework import serializers
 
+from bandkamp.serializers import ChangedFieldsUpdateMixin
+from .fields import SongDurationField
 from .models import Song
 
 
-class SongSerializer(serializers.ModelSerializer):
+class SongListSerializer(serializers.ListSerializer):
+    def create(self, validated_data: list[dict]) -> list[Song]:
+        songs = [Song(**song_data) for song_data in validated_data]
+        return Song.objects.bulk_create(
+            songs, batch_size=settings.SONG_IMPORT_CHUNK_SIZE
+        )
+
+
+class SongSerializer(ChangedFieldsUpdateMixin, serializers.ModelSerializer):
+    duration = SongDurationField()
+
     class Meta:
         model = Song
         fields = ["id", "title", "duration", "album_id"]
+        list_serializer_class = SongListSerializer
 
     def create(self, validated_data):
         return Song.objects.create(**validated_data)
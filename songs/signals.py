@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bandkamp.cache import album_scope, bump_generation_on_commit
+from .models import Song
+
+
+@receiver([post_save, post_delete], sender=Song)
+def bump_song_generations(sender, instance: Song, **kwargs):
+    bump_generation_on_commit(
+        sender._meta.label_lower, album_scope(instance.album_id), using=kwargs["using"]
+    )
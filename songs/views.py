@@ -1,19 +1,93 @@
+from collections.abc import Iterator
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from users.authentication import CachedJWTAuthentication
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from rest_framework.serializers import ValidationError
+from rest_framework.settings import api_settings
+from rest_framework.views import status
 from .models import Song
 from .serializers import SongSerializer
 from albums.models import Album
 from rest_framework.generics import ListCreateAPIView
+from bandkamp.cache import (
+    OWNER_DELETIONS_SCOPE,
+    ConditionalGetMixin,
+    GenerationCacheMixin,
+    album_scope,
+    bump_generation,
+)
+from bandkamp.pagination import PaginationModeMixin
+from bandkamp.parsers import NDJSONParser
 
 
-class SongView(ListCreateAPIView):
-    authentication_classes = [JWTAuthentication]
+class SongView(
+    ConditionalGetMixin,
+    GenerationCacheMixin,
+    PaginationModeMixin,
+    ListCreateAPIView,
+):
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAuthenticatedOrReadOnly]
+    parser_classes = [*api_settings.DEFAULT_PARSER_CLASSES, NDJSONParser]
     serializer_class = SongSerializer
 
+    # Maximum number of queries per request, independent of page size.
+    query_budget = {"GET": 2, "POST": 3}
+
+    def get_generation_scopes(self):
+        return [album_scope(self.kwargs["pk"]), OWNER_DELETIONS_SCOPE]
+
     def get_queryset(self):
-        return Song.objects.filter(album_id=self.kwargs["pk"])
+        return Song.objects.filter(
+            album_id=self.kwargs["pk"], album__user__deletion_requested_at__isnull=True
+        )
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, (list, Iterator)):
+            return super().create(request, *args, **kwargs)
+
+        album = get_object_or_404(Album, pk=self.kwargs["pk"])
+
+        if isinstance(request.data, list):
+            serializer = self.get_serializer(data=request.data, many=True)
+            serializer.is_valid(raise_exception=True)
+            serializer.save(album=album)
+            self.bump_generations(album)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+        # NDJSON: validate and insert chunk by chunk while the body is read.
+        count = 0
+        with transaction.atomic():
+            for serializer in self.validate_stream(request.data):
+                serializer.save(album=album)
+                count += len(serializer.instance)
+        self.bump_generations(album)
+
+        return Response({"count": count}, status=status.HTTP_201_CREATED)
+
+    def validate_stream(self, lines):
+        chunk_size = settings.SONG_IMPORT_CHUNK_SIZE
+        while chunk := list(islice(lines, chunk_size)):
+            line_numbers, songs_data = zip(*chunk)
+            serializer = self.get_serializer(data=list(songs_data), many=True)
+            if not serializer.is_valid():
+                raise ValidationError(
+                    {
+                        str(line_number): errors
+                        for line_number, errors in zip(line_numbers, serializer.errors)
+                        if errors
+                    }
+                )
+            yield serializer
+
+    def bump_generations(self, album: Album):
+        # bulk_create does not send post_save, so invalidate here.
+        bump_generation(Song._meta.label_lower, album_scope(album.pk))
 
     def perform_create(self, serializer):
         album = get_object_or_404(Album, pk=self.kwargs["pk"])
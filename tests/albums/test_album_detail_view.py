@@ -0,0 +1,113 @@
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+from tests.factories import (
+    create_user_with_token,
+    create_album_with_user,
+    create_multiple_albums_with_user,
+    create_multiple_songs_with_album,
+)
+from tests.query_budget import assert_query_budget
+from albums.views import AlbumDetailView, AlbumView
+
+
+class AlbumDetailViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user, token = create_user_with_token()
+        cls.access_token = str(token.access_token)
+
+        cls.album = create_album_with_user(user=cls.user)
+        cls.songs = create_multiple_songs_with_album(cls.user, 3, album=cls.album)
+
+        cls.BASE_URL = f"/api/albums/{cls.album.pk}/"
+
+        # UnitTest Longer Logs
+        cls.maxDiff = None
+
+    def test_retrieve_album_with_songs(self):
+        with assert_query_budget(self, AlbumDetailView, "GET"):
+            response = self.client.get(self.BASE_URL)
+
+        # STATUS CODE
+        expected_status_code = status.HTTP_200_OK
+        msg = (
+            "Verifique se o status code retornado do GET "
+            + f"em `{self.BASE_URL}` é {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+
+        # RETORNO JSON
+        resulted_data = response.json()
+        expected_songs = [
+            {
+                "id": song.id,
+                "title": song.title,
+                "duration": song.duration,
+                "album_id": self.album.pk,
+            }
+            for song in self.songs
+        ]
+        msg = f"Verifique se as músicas do álbum são retornadas em `{self.BASE_URL}`"
+        self.assertListEqual(expected_songs, resulted_data["songs"], msg)
+        self.assertEqual(self.user.pk, resulted_data["user"]["id"])
+
+        # DURAÇÃO TOTAL
+        msg = f"Verifique se a duração total e o número de faixas estão corretos em `{self.BASE_URL}`"
+        self.assertEqual(3, resulted_data["track_count"], msg)
+        self.assertEqual(11 + 12 + 13, resulted_data["total_duration"], msg)
+
+    def test_retrieve_non_existent_album(self):
+        response = self.client.get("/api/albums/9999/")
+
+        expected_status_code = status.HTTP_404_NOT_FOUND
+        msg = (
+            "Verifique se o GET de um álbum inexistente "
+            + f"retorna {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+
+    def test_no_etag_without_shared_cache(self):
+        etag = self.client.get(self.BASE_URL)["ETag"]
+
+        with override_settings(SHARED_CACHE=False):
+            response = self.client.get(self.BASE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        msg = "Verifique se sem cache compartilhado o `If-None-Match` é ignorado"
+        self.assertEqual(status.HTTP_200_OK, response.status_code, msg)
+        msg = "Verifique se sem cache compartilhado nenhum ETag é emitido"
+        self.assertNotIn("ETag", response, msg)
+
+    def test_retrieve_album_after_song_creation(self):
+        etag = self.client.get(self.BASE_URL)["ETag"]
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token)
+        song_data = {"title": "Unreachable", "duration": "130"}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"{self.BASE_URL}songs/", data=song_data, format="json")
+        self.client.credentials()
+
+        response = self.client.get(self.BASE_URL, HTTP_IF_NONE_MATCH=etag)
+        msg = f"Verifique se `{self.BASE_URL}` é atualizado após criar uma música"
+        self.assertEqual(status.HTTP_200_OK, response.status_code, msg)
+        self.assertEqual(4, len(response.json()["songs"]), msg)
+
+    def test_albums_listing_including_songs(self):
+        albums = create_multiple_albums_with_user(self.user, 2)
+        create_multiple_songs_with_album(self.user, 2, album=albums[0])
+
+        with assert_query_budget(self, AlbumView, "GET ?include=songs"):
+            response = self.client.get("/api/albums/", {"include": "songs", "page": 1})
+
+        results = response.json()["results"]
+        returned_songs = [len(album["songs"]) for album in results]
+        msg = "Verifique se `?include=songs` embute as músicas de cada álbum"
+        self.assertListEqual([3, 2], returned_songs, msg)
+
+        returned_durations = [album["total_duration"] for album in results]
+        msg = "Verifique se `?include=songs` retorna a duração total de cada álbum"
+        self.assertListEqual([36, 23], returned_durations, msg)
+
+        response = self.client.get("/api/albums/")
+        msg = "Verifique se a listagem sem `include` não embute as músicas"
+        self.assertNotIn("songs", response.json()["results"][0], msg)
@@ -0,0 +1,51 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from albums.serializers import AlbumSerializer
+from songs.serializers import SongSerializer
+from tests.factories import create_song_with_album, create_user_with_token
+
+
+class ChangedFieldsUpdateTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user, _ = create_user_with_token()
+        cls.song = create_song_with_album(cls.user)
+        cls.album = cls.song.album
+
+    def update(self, serializer_class, instance, data: dict) -> list[str]:
+        serializer = serializer_class(instance, data=data, partial=True)
+        serializer.is_valid(raise_exception=True)
+
+        with CaptureQueriesContext(connection) as context:
+            serializer.save()
+
+        return [query["sql"] for query in context.captured_queries]
+
+    def test_album_update_writes_only_changed_fields(self):
+        queries = self.update(AlbumSerializer, self.album, {"year": 2001})
+
+        msg = "Verifique se a atualização do álbum grava apenas o campo alterado"
+        self.assertEqual(len(queries), 1, msg)
+        self.assertIn('"year"', queries[0], msg)
+        self.assertNotIn('"name"', queries[0], msg)
+
+    def test_album_update_without_changes_skips_write(self):
+        queries = self.update(
+            AlbumSerializer, self.album, {"name": self.album.name, "year": self.album.year}
+        )
+
+        msg = "Verifique se a atualização sem alterações não executa queries"
+        self.assertListEqual(queries, [], msg)
+
+    def test_song_update_writes_only_changed_fields(self):
+        queries = self.update(SongSerializer, self.song, {"duration": "3:00"})
+
+        msg = "Verifique se a atualização da música grava apenas o campo alterado"
+        self.assertEqual(len(queries), 1, msg)
+        self.assertIn('"duration"', queries[0], msg)
+        self.assertNotIn('"title"', queries[0], msg)
+
+        self.song.refresh_from_db()
+        self.assertEqual(self.song.duration, 180)
@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+from tests.factories import (
+    create_user_with_token,
+    create_multiple_albums_with_user,
+    create_multiple_songs_with_album,
+)
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class AlbumExportViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.BASE_URL = "/api/albums/export/"
+
+        cls.user, _ = create_user_with_token()
+        cls.albums = create_multiple_albums_with_user(cls.user, 3)
+        create_multiple_songs_with_album(cls.user, 2, album=cls.albums[0])
+        create_multiple_songs_with_album(cls.user, 1, album=cls.albums[2])
+
+        # UnitTest Longer Logs
+        cls.maxDiff = None
+
+    def get_lines(self, response) -> list[dict]:
+        content = b"".join(response.streaming_content).decode()
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_export_ndjson(self):
+        # Two keyset batches of albums + songs, plus the empty batch that ends it
+        with self.assertNumQueries(5):
+            response = self.client.get(self.BASE_URL)
+            lines = self.get_lines(response)
+
+        # STATUS CODE
+        expected_status_code = status.HTTP_200_OK
+        msg = (
+            "Verifique se o status code retornado do GET "
+            + f"em `{self.BASE_URL}` é {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+        self.assertTrue(response["Content-Type"].startswith("application/x-ndjson"))
+
+        # RETORNO NDJSON
+        returned_ids = [album["id"] for album in lines]
+        expected_ids = [album.id for album in self.albums]
+        msg = "Verifique se todos os álbuns são exportados ordenados por id"
+        self.assertListEqual(expected_ids, returned_ids, msg)
+
+        returned_songs = [len(album["songs"]) for album in lines]
+        msg = "Verifique se as músicas de cada álbum são exportadas junto do álbum"
+        self.assertListEqual([2, 0, 1], returned_songs, msg)
+        self.assertEqual(self.user.pk, lines[0]["user"]["id"])
+
+    def test_export_csv(self):
+        response = self.client.get(self.BASE_URL, {"format": "csv"})
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+
+        # UMA LINHA POR MÚSICA E POR ÁLBUM SEM MÚSICAS
+        returned_rows = [(row["album_id"], row["song_title"]) for row in rows]
+        expected_rows = [
+            (str(self.albums[0].id), "Song 1"),
+            (str(self.albums[0].id), "Song 2"),
+            (str(self.albums[1].id), ""),
+            (str(self.albums[2].id), "Song 1"),
+        ]
+        msg = "Verifique se o CSV possui uma linha por música exportada"
+        self.assertListEqual(expected_rows, returned_rows, msg)
+
+    def test_export_resume_from_id(self):
+        response = self.client.get(self.BASE_URL, {"after_id": self.albums[0].id})
+        lines = self.get_lines(response)
+
+        returned_ids = [album["id"] for album in lines]
+        expected_ids = [album.id for album in self.albums[1:]]
+        msg = "Verifique se `after_id` retoma a exportação a partir do id informado"
+        self.assertListEqual(expected_ids, returned_ids, msg)
+
+    def test_export_with_invalid_filter(self):
+        response = self.client.get(self.BASE_URL, {"user": "abc"})
+
+        expected_status_code = status.HTTP_400_BAD_REQUEST
+        msg = (
+            "Verifique se o GET com filtro inválido "
+            + f"em `{self.BASE_URL}` retorna {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+
+    def test_export_errors_are_json(self):
+        for accept in ["application/x-ndjson", "text/csv", "application/json"]:
+            with self.subTest(accept=accept):
+                response = self.client.get(
+                    self.BASE_URL, {"user": "abc"}, HTTP_ACCEPT=accept
+                )
+
+                msg = "Verifique se erros da exportação são retornados em JSON"
+                self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code, msg)
+                self.assertEqual("application/json", response["Content-Type"], msg)
+                self.assertIn("user", response.json(), msg)
+
+    def test_export_as_json_is_not_acceptable(self):
+        response = self.client.get(self.BASE_URL, HTTP_ACCEPT="application/json")
+
+        msg = "Verifique se pedir a exportação em JSON retorna um erro 406 em JSON"
+        self.assertEqual(status.HTTP_406_NOT_ACCEPTABLE, response.status_code, msg)
+        self.assertIn("detail", response.json(), msg)
+
+    async def test_export_is_refused_under_asgi(self):
+        response = await self.async_client.get(self.BASE_URL)
+
+        msg = "Verifique se sob ASGI a exportação é recusada antes de transmitir"
+        self.assertEqual(status.HTTP_501_NOT_IMPLEMENTED, response.status_code, msg)
+        self.assertFalse(response.streaming, msg)
+        self.assertIn("detail", response.json(), msg)
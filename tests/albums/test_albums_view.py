@@ -1,6 +1,10 @@
+from django.test import override_settings
 from rest_framework.test import APITestCase
 from rest_framework.views import status
 from tests.factories import create_user_with_token, create_multiple_albums_with_user
+from tests.query_budget import assert_query_budget
+from albums.views import AlbumView
+from bandkamp.cache import ALBUM_LIST_SCOPE, get_generation
 import ipdb
 
 
@@ -30,6 +34,128 @@ class AlbumViewTest(APITestCase):
         msg = "Verifique se a paginação está retornando apenas dois items de cada vez"
         self.assertEqual(expected_len, results_len, msg)
 
+    def test_albums_listing_query_budget(self):
+        for index in range(10):
+            user, _ = create_user_with_token(
+                {
+                    "username": f"artist_{index}",
+                    "email": f"artist_{index}@kenziebuster.com",
+                    "artistic_name": f"Artist {index}",
+                    "password": "1234",
+                }
+            )
+            create_multiple_albums_with_user(user, 1)
+
+        with assert_query_budget(self, AlbumView, "GET"):
+            response = self.client.get(self.BASE_URL, {"page": 2})
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        returned_users = {album["user"]["id"] for album in response.json()["results"]}
+        msg = "Verifique se os álbuns da página são de usuários diferentes"
+        self.assertEqual(2, len(returned_users), msg)
+
+    def test_albums_listing_keyset_pagination(self):
+        user, _ = create_user_with_token()
+        albums = create_multiple_albums_with_user(user, 5)
+
+        response = self.client.get(self.BASE_URL, {"pagination": "cursor"})
+        resulted_data = response.json()
+
+        # RETORNO CHAVES
+        expected_pagination_keys = {"next", "previous", "results"}
+        msg = "Verifique se a paginação por cursor não retorna `count`"
+        self.assertSetEqual(expected_pagination_keys, set(resulted_data.keys()), msg)
+
+        # PERCORRENDO TODAS AS PÁGINAS
+        returned_ids = [album["id"] for album in resulted_data["results"]]
+        while resulted_data["next"]:
+            resulted_data = self.client.get(resulted_data["next"]).json()
+            returned_ids.extend(album["id"] for album in resulted_data["results"])
+
+        expected_ids = [album.id for album in albums]
+        msg = "Verifique se os cursores percorrem todos os álbuns ordenados por id"
+        self.assertListEqual(expected_ids, returned_ids, msg)
+
+    def test_albums_listing_count_is_cached(self):
+        user, token = create_user_with_token()
+        create_multiple_albums_with_user(user, 3)
+        self.client.get(self.BASE_URL)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.BASE_URL, {"page": 2})
+
+        msg = "Verifique se o `count` é reaproveitado entre requisições"
+        self.assertEqual(3, response.json()["count"], msg)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + str(token.access_token))
+        album_data = {"name": "Shadows Collide with People", "year": 2000}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.BASE_URL, data=album_data, format="json")
+
+        response = self.client.get(self.BASE_URL)
+        msg = "Verifique se o `count` é invalidado após a criação de um álbum"
+        self.assertEqual(4, response.json()["count"], msg)
+
+    def test_albums_listing_cache_is_invalidated_only_on_commit(self):
+        user, _ = create_user_with_token()
+        albums = create_multiple_albums_with_user(user, 1)
+        before = get_generation(ALBUM_LIST_SCOPE)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            albums[0].name = "Uncommitted"
+            albums[0].save()
+            msg = "Verifique se a geração não muda antes do commit da escrita"
+            self.assertEqual(before, get_generation(ALBUM_LIST_SCOPE), msg)
+
+        for callback in callbacks:
+            callback()
+        msg = "Verifique se a geração muda depois do commit da escrita"
+        self.assertNotEqual(before, get_generation(ALBUM_LIST_SCOPE), msg)
+
+    def test_albums_listing_response_is_cached(self):
+        user, token = create_user_with_token()
+        create_multiple_albums_with_user(user, 1)
+        self.client.get(self.BASE_URL)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.BASE_URL)
+
+        msg = "Verifique se a página cacheada mantém o mesmo conteúdo"
+        self.assertEqual(1, len(response.json()["results"]), msg)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + str(token.access_token))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"/api/users/{user.pk}/", data={"artistic_name": "Renamed"}, format="json"
+            )
+        self.client.credentials()
+
+        response = self.client.get(self.BASE_URL)
+        returned_name = response.json()["results"][0]["user"]["artistic_name"]
+        msg = "Verifique se a página cacheada é invalidada ao atualizar o dono do álbum"
+        self.assertEqual("Renamed", returned_name, msg)
+
+    @override_settings(SHARED_CACHE=False)
+    def test_albums_listing_is_not_cached_without_shared_cache(self):
+        user, _ = create_user_with_token()
+        create_multiple_albums_with_user(user, 1)
+        self.client.get(self.BASE_URL)
+
+        # Another worker's writes would never reach this worker's cache, so
+        # both the page and the count are read again.
+        with self.assertNumQueries(2):
+            self.client.get(self.BASE_URL)
+
+    def test_album_creation_query_budget(self):
+        _, token = create_user_with_token()
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + str(token.access_token))
+        album_data = {"name": "Shadows Collide with People", "year": 2000}
+
+        with assert_query_budget(self, AlbumView, "POST"):
+            response = self.client.post(self.BASE_URL, data=album_data, format="json")
+
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+
     def test_album_creation_without_required_fields(self):
         _, token = create_user_with_token()
         self.client.credentials(HTTP_AUTHORIZATION="Bearer " + str(token.access_token))
@@ -113,3 +239,70 @@ class AlbumViewTest(APITestCase):
             + f"em `{self.BASE_URL}` estão corretas."
         )
         self.assertDictEqual(expected_data, resulted_data, msg)
+
+    def test_bulk_album_creation(self):
+        user, token = create_user_with_token()
+        self.client.get(self.BASE_URL)
+        albums_data = [
+            {"name": f"Album {index}", "year": 2000 + index} for index in range(3)
+        ]
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + str(token.access_token))
+        with assert_query_budget(self, AlbumView, "POST"):
+            response = self.client.post(self.BASE_URL, data=albums_data, format="json")
+
+        # STATUS CODE
+        expected_status_code = status.HTTP_201_CREATED
+        msg = (
+            "Verifique se o status code retornado do POST em lote "
+            + f"em `{self.BASE_URL}` é {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+
+        # RETORNO JSON
+        resulted_data = response.json()
+        returned_names = [album["name"] for album in resulted_data]
+        expected_names = [album["name"] for album in albums_data]
+        msg = "Verifique se todos os álbuns do lote são retornados na ordem enviada"
+        self.assertListEqual(expected_names, returned_names, msg)
+        self.assertTrue(all(album["id"] for album in resulted_data), msg)
+        self.assertTrue(all(album["user"]["id"] == user.pk for album in resulted_data))
+
+        # LISTAGEM ATUALIZADA
+        response = self.client.get(self.BASE_URL)
+        msg = "Verifique se a listagem é invalidada após a criação em lote"
+        self.assertEqual(3, response.json()["count"], msg)
+
+    def test_bulk_album_creation_with_invalid_item(self):
+        _, token = create_user_with_token()
+        albums_data = [{"name": "Album 1", "year": 2000}, {"name": "Album 2"}]
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + str(token.access_token))
+        response = self.client.post(self.BASE_URL, data=albums_data, format="json")
+
+        expected_status_code = status.HTTP_400_BAD_REQUEST
+        msg = (
+            "Verifique se o POST em lote com um item inválido "
+            + f"em `{self.BASE_URL}` retorna {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+        self.assertListEqual([{}, {"year": ["This field is required."]}], response.json())
+
+        response = self.client.get(self.BASE_URL)
+        msg = "Verifique se nenhum álbum do lote é criado quando um item é inválido"
+        self.assertEqual(0, response.json()["count"], msg)
+
+    @override_settings(ALBUM_BULK_CREATE_MAX_BATCH=2)
+    def test_bulk_album_creation_above_max_batch(self):
+        _, token = create_user_with_token()
+        albums_data = [{"name": f"Album {index}", "year": 2000} for index in range(3)]
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + str(token.access_token))
+        response = self.client.post(self.BASE_URL, data=albums_data, format="json")
+
+        expected_status_code = status.HTTP_400_BAD_REQUEST
+        msg = (
+            "Verifique se o POST em lote acima do limite "
+            + f"em `{self.BASE_URL}` retorna {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
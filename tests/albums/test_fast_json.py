@@ -0,0 +1,128 @@
+import datetime
+import decimal
+import io
+import uuid
+from unittest import mock
+
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from bandkamp.parsers import FastJSONParser
+from bandkamp.renderers import FastJSONRenderer
+from tests.factories import create_multiple_albums_with_user, create_user_with_token
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    def assertSameBytes(self, data, **kwargs):
+        msg = f"Verifique se {data!r} é renderizado igual ao JSONRenderer do DRF"
+        self.assertEqual(
+            FastJSONRenderer().render(data, **kwargs),
+            JSONRenderer().render(data, **kwargs),
+            msg,
+        )
+
+    def test_matches_drf_output(self):
+        values = [
+            None,
+            {"name": "Ação", "nested": {"list": [1, 2.5, True, None]}, 1: "int key"},
+            [datetime.datetime(2023, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc)],
+            [datetime.date(2023, 1, 2), datetime.time(3, 4, 5, 678901)],
+            [datetime.timedelta(seconds=90), decimal.Decimal("1.10"), uuid.UUID(int=1)],
+            ["line\u2028separator\u2029paragraph"],
+            [2**64, -(2**63) - 1],
+            [1e16, 1e-7, 0.00001234, 0.1, 123.456],
+            [decimal.Decimal("1E+20"), decimal.Decimal("0.00001"), None],
+            ("tuple", "of", "strings"),
+        ]
+        for value in values:
+            with self.subTest(value=value):
+                self.assertSameBytes(value)
+
+    def test_non_finite_floats_fall_back_to_drf(self):
+        values = [float("nan"), float("inf"), -float("inf"), decimal.Decimal("NaN")]
+        for value in values:
+            data = {"rank": value, "next": None}
+            with self.subTest(value=value):
+                msg = "Verifique se NaN e infinito são recusados como no JSONRenderer"
+                with self.assertRaises(ValueError, msg=msg):
+                    FastJSONRenderer().render(data)
+
+                with mock.patch.object(JSONRenderer, "strict", False):
+                    self.assertSameBytes(data)
+
+    def test_exponent_like_strings_are_rendered_by_orjson(self):
+        data = {"name": "Model 1e5", "email": "a1e2@x.com", "id": 10, "rank": 0.5}
+        self.assertSameBytes(data)
+
+        with mock.patch.object(JSONRenderer, "render") as fallback:
+            FastJSONRenderer().render(data)
+        msg = "Verifique se textos parecidos com expoentes não causam fallback"
+        self.assertFalse(fallback.called, msg)
+
+    def test_matches_drf_indented_output(self):
+        self.assertSameBytes(
+            {"a": [1, 2]}, accepted_media_type="application/json; indent=4"
+        )
+
+
+class FastJSONParserTest(SimpleTestCase):
+    def parse(self, parser, body: bytes):
+        return parser.parse(io.BytesIO(body), parser_context={})
+
+    def test_matches_drf_parsing(self):
+        bodies = [
+            b'{"name": "A\\u00e7\\u00e3o", "year": 2000, "songs": [1.5, null, true]}',
+            b'"\\ud800"',
+            b"1e400",
+        ]
+        msg = "Verifique se o corpo é lido igual ao JSONParser do DRF"
+        for body in bodies:
+            with self.subTest(body=body):
+                self.assertEqual(
+                    self.parse(FastJSONParser(), body),
+                    self.parse(JSONParser(), body),
+                    msg,
+                )
+
+    def test_invalid_bodies_raise_drf_errors(self):
+        for body in [b'{"name": ', b"NaN", b""]:
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError) as expected:
+                    self.parse(JSONParser(), body)
+                with self.assertRaises(ParseError) as resulted:
+                    self.parse(FastJSONParser(), body)
+
+                msg = "Verifique se a mensagem de erro é a mesma do JSONParser do DRF"
+                self.assertEqual(
+                    str(expected.exception.detail), str(resulted.exception.detail), msg
+                )
+
+
+class AlbumsFastJSONTest(APITestCase):
+    def test_album_listing_bytes(self):
+        user, _ = create_user_with_token()
+        create_multiple_albums_with_user(user, 3)
+
+        response = self.client.get("/api/albums/")
+
+        msg = "Verifique se a listagem de álbuns é idêntica à renderizada pelo DRF"
+        self.assertEqual(response.content, JSONRenderer().render(response.data), msg)
+
+        with mock.patch.object(JSONRenderer, "render") as fallback:
+            FastJSONRenderer().render(response.data)
+        msg = "Verifique se a listagem é renderizada pelo orjson, sem fallback"
+        self.assertFalse(fallback.called, msg)
+
+    def test_album_creation_parses_json(self):
+        _, token = create_user_with_token()
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + str(token.access_token))
+
+        response = self.client.post(
+            "/api/albums/", data={"name": "Ação", "year": 2000}, format="json"
+        )
+
+        msg = "Verifique se o corpo JSON do POST é lido corretamente"
+        self.assertEqual(response.json()["name"], "Ação", msg)
@@ -0,0 +1,64 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from albums.models import Album
+from songs.models import Song
+from tests.factories import create_album_with_user, create_user_with_token
+from users.models import User
+
+
+class GenerateCatalogCommandTest(TestCase):
+    def generate(self, *args):
+        call_command("generate_catalog", *args, stdout=StringIO())
+
+    def catalog(self):
+        return (
+            list(User.objects.values_list("username", "artistic_name")),
+            list(Album.objects.values_list("name", "year", "user__username")),
+            list(Song.objects.values_list("title", "duration", "album__name")),
+        )
+
+    def test_generates_catalog_with_fan_out(self):
+        self.generate(
+            "--users", "5", "--albums-per-user", "2", "--songs-per-album", "3",
+            "--batch-size", "7",
+        )
+
+        msg = "Verifique se a quantidade de registros gerados respeita o fan-out"
+        self.assertEqual(User.objects.count(), 5, msg)
+        self.assertEqual(Album.objects.count(), 10, msg)
+        self.assertEqual(Song.objects.count(), 30, msg)
+
+        user = User.objects.first()
+        msg = "Verifique se os usuários gerados conseguem fazer login"
+        self.assertTrue(user.check_password("1234"), msg)
+
+    def test_same_seed_generates_same_catalog(self):
+        self.generate("--users", "4", "--seed", "7")
+        first = self.catalog()
+
+        User.objects.all().delete()
+        self.generate("--users", "4", "--seed", "7")
+
+        msg = "Verifique se a mesma seed gera o mesmo catálogo"
+        self.assertEqual(first, self.catalog(), msg)
+
+    def test_appends_after_existing_rows(self):
+        user, _ = create_user_with_token()
+        album = create_album_with_user(user)
+        self.generate("--users", "2", "--albums-per-user", "1")
+
+        msg = "Verifique se o catálogo é gerado após os registros existentes"
+        self.assertEqual(Album.objects.count(), 3, msg)
+        self.assertTrue(Album.objects.filter(pk=album.pk, user=user).exists(), msg)
+
+        new_album = Album.objects.create(name="Depois", year=2000, user=user)
+        msg = "Verifique se novos registros continuam recebendo ids livres"
+        self.assertGreater(new_album.pk, album.pk + 2, msg)
+
+    def test_invalid_fan_out(self):
+        with self.assertRaises(CommandError):
+            self.generate("--albums-per-user", "5-1")
@@ -0,0 +1,75 @@
+import runpy
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from bandkamp.warmup import STEPS, warm_up
+from search import typeahead
+
+GUNICORN_CONF = Path(settings.BASE_DIR) / "gunicorn.conf.py"
+
+
+class WarmupCommandTest(TestCase):
+    def test_reports_every_step(self):
+        output = StringIO()
+        call_command("warmup", stdout=output)
+
+        msg = "Verifique se o relatório mostra o tempo de cada etapa do warm-up"
+        for step in STEPS:
+            self.assertIn(f"Warm-up {step}:", output.getvalue(), msg)
+        self.assertIn("Warm-up finished in", output.getvalue(), msg)
+
+        msg = "Verifique se o warm-up constrói os índices de typeahead"
+        self.assertIsNotNone(typeahead.albums.built_at, msg)
+
+    def test_runs_selected_steps(self):
+        output = StringIO()
+        call_command("warmup", "urls", stdout=output)
+
+        msg = "Verifique se apenas as etapas pedidas são executadas"
+        self.assertIn("Warm-up urls:", output.getvalue(), msg)
+        self.assertNotIn("Warm-up database:", output.getvalue(), msg)
+
+    def test_unknown_step(self):
+        with self.assertRaises(CommandError):
+            call_command("warmup", "nope", stdout=StringIO())
+
+
+class WarmupFailureTest(TestCase):
+    def setUp(self):
+        failing = mock.Mock(side_effect=ConnectionError("database is down"))
+        self.steps = mock.patch.dict(STEPS, {"database": failing})
+        self.steps.start()
+        self.addCleanup(self.steps.stop)
+
+    def test_failing_step_raises_by_default(self):
+        with mock.patch("bandkamp.warmup.connections.close_all") as close_all:
+            with self.assertRaises(ConnectionError):
+                warm_up(["database"], close_connections=True)
+
+        msg = "Verifique se as conexões são fechadas mesmo quando uma etapa falha"
+        self.assertTrue(close_all.called, msg)
+
+    def test_gunicorn_hooks_log_failures_and_keep_going(self):
+        hooks = runpy.run_path(str(GUNICORN_CONF))
+        server = mock.Mock()
+
+        with mock.patch("bandkamp.warmup.connections.close_all") as close_all:
+            hooks["when_ready"](server)
+        hooks["post_worker_init"](server)
+
+        msg = "Verifique se a falha de cada etapa é registrada no log do gunicorn"
+        failures = [call.args[1] for call in server.log.exception.call_args_list]
+        self.assertListEqual(["database", "database"], failures, msg)
+
+        msg = "Verifique se as etapas seguintes à que falhou ainda são executadas"
+        reported = " ".join(call.args[0] for call in server.log.info.call_args_list)
+        self.assertIn("Warm-up typeahead:", reported, msg)
+
+        msg = "Verifique se as conexões são fechadas antes do fork"
+        self.assertTrue(close_all.called, msg)
@@ -0,0 +1,42 @@
+import pytest
+from django.core.cache import cache
+from django.core.management.color import no_style
+from django.db import connection
+from django.test import TransactionTestCase
+
+from albums.models import Album
+from search import typeahead
+from songs.models import Song
+from users import authentication
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Test transactions are rolled back without firing post_delete, so cached
+    # counts, generations and in-process indexes must not leak from one test
+    # into the next.
+    cache.clear()
+    typeahead.reset()
+    authentication.tokens.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def shared_cache(settings):
+    # The test process is the only worker, so its local cache is shared.
+    settings.SHARED_CACHE = True
+
+
+@pytest.fixture(autouse=True)
+def reset_catalog_sequences(request, django_db_blocker):
+    yield
+    # Postgres sequences survive the rollback of a test, and the original album
+    # and song creation tests expect the first id: put them back behind the
+    # rows that are left.
+    if connection.vendor != "postgresql" or not isinstance(
+        request.instance, TransactionTestCase
+    ):
+        return
+    with django_db_blocker.unblock(), connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), [Album, Song]):
+            cursor.execute(sql)
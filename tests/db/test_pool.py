@@ -0,0 +1,191 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.db import OperationalError
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase
+
+from bandkamp.db.backends.pooling import close_pools, pool_stats
+from bandkamp.db.pool import ConnectionPool, PoolTimeout
+
+
+def connect():
+    return sqlite3.connect(":memory:", check_same_thread=False)
+
+
+def check(connection):
+    connection.execute("SELECT 1")
+    return True
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    def make_pool(self, **options):
+        pool = ConnectionPool(connect, check=check, **options)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_reuses_released_connections(self):
+        pool = self.make_pool(max_size=2)
+
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+
+        msg = "Verifique se uma conexão devolvida ao pool é reutilizada"
+        self.assertIs(first, second, msg)
+        self.assertEqual(pool.stats()["created"], 1, msg)
+
+    def test_size_is_bounded(self):
+        pool = self.make_pool(max_size=2, timeout=0.05)
+        pool.acquire()
+        pool.acquire()
+
+        msg = "Verifique se o pool não abre mais que `max_size` conexões"
+        with self.assertRaises(PoolTimeout, msg=msg):
+            pool.acquire()
+
+        msg = "Verifique se o timeout do pool é tratado como um OperationalError"
+        with self.assertRaises(OperationalError, msg=msg):
+            pool.acquire()
+
+        stats = pool.stats()
+        msg = "Verifique se as estatísticas registram o timeout"
+        self.assertEqual(stats["size"], 2, msg)
+        self.assertEqual(stats["in_use"], 2, msg)
+        self.assertEqual(stats["timeouts"], 2, msg)
+
+    def test_waits_for_a_released_connection(self):
+        pool = self.make_pool(max_size=1, timeout=5)
+        connection = pool.acquire()
+        releaser = threading.Timer(0.05, pool.release, args=(connection,))
+        releaser.start()
+        self.addCleanup(releaser.join)
+
+        msg = "Verifique se `acquire` espera uma conexão ser devolvida"
+        self.assertIs(pool.acquire(), connection, msg)
+
+        stats = pool.stats()
+        msg = "Verifique se o tempo de espera pela conexão é registrado"
+        self.assertEqual(stats["waits"], 1, msg)
+        self.assertGreater(stats["wait_max_ms"], 0, msg)
+        self.assertEqual(stats["checkouts"], 2, msg)
+
+    def test_replaces_broken_connections(self):
+        pool = self.make_pool(check_interval=0)
+        broken = pool.acquire()
+        pool.release(broken)
+        broken.close()
+
+        connection = pool.acquire()
+
+        msg = "Verifique se uma conexão que falha no health check é descartada"
+        self.assertIsNot(connection, broken, msg)
+        self.assertTrue(check(connection), msg)
+        self.assertEqual(pool.stats()["discarded"], 1, msg)
+        self.assertEqual(pool.stats()["size"], 1, msg)
+
+    def test_skips_check_for_recently_used_connections(self):
+        checked = []
+        pool = ConnectionPool(connect, check=checked.append, check_interval=60)
+        self.addCleanup(pool.close)
+        pool.release(pool.acquire())
+        pool.acquire()
+
+        msg = "Verifique se conexões usadas recentemente não são verificadas"
+        self.assertEqual(checked, [], msg)
+
+    def test_evicts_idle_connections_above_min_size(self):
+        pool = self.make_pool(max_size=3, min_size=1, max_idle=0.01)
+        connections = [pool.acquire() for _ in range(3)]
+        for connection in connections:
+            pool.release(connection)
+        time.sleep(0.02)
+
+        pool.acquire()
+
+        stats = pool.stats()
+        msg = "Verifique se conexões ociosas são fechadas, mantendo `min_size`"
+        self.assertEqual(stats["evicted"], 2, msg)
+        self.assertEqual(stats["size"], 1, msg)
+
+    def test_closes_connections_past_max_lifetime(self):
+        pool = self.make_pool(max_lifetime=0.01)
+        first = pool.acquire()
+        time.sleep(0.02)
+        pool.release(first)
+
+        msg = "Verifique se conexões mais velhas que `max_lifetime` são fechadas"
+        self.assertIsNot(pool.acquire(), first, msg)
+        self.assertEqual(pool.stats()["created"], 2, msg)
+
+    def test_resets_connections_on_release(self):
+        pool = self.make_pool(reset=lambda connection: connection.rollback())
+        connection = pool.acquire()
+        connection.execute("CREATE TABLE t (id integer)")
+        connection.execute("BEGIN")
+        connection.execute("INSERT INTO t VALUES (1)")
+        pool.release(connection)
+
+        msg = "Verifique se uma transação aberta é desfeita ao devolver a conexão"
+        count = pool.acquire().execute("SELECT count(*) FROM t").fetchone()[0]
+        self.assertEqual(count, 0, msg)
+
+
+class PooledDatabaseWrapperTest(SimpleTestCase):
+    # Lifts the test runner's block on database access; the test only uses
+    # its own handler, never the project's connections.
+    databases = {"default"}
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.connections = ConnectionHandler(
+            {
+                "default": {
+                    "ENGINE": "bandkamp.db.backends.sqlite3",
+                    "NAME": os.path.join(directory.name, "pooled.sqlite3"),
+                    "POOL": {"MAX_SIZE": 2, "TIMEOUT": 1},
+                }
+            }
+        )
+        self.addCleanup(close_pools)
+        self.addCleanup(self.connections.close_all)
+
+    def test_reconnects_through_the_pool(self):
+        wrapper = self.connections["default"]
+        wrapper.ensure_connection()
+        first = wrapper.connection
+        wrapper.close()
+
+        msg = "Verifique se fechar a conexão a devolve ao pool"
+        self.assertIsNone(wrapper.connection, msg)
+        self.assertEqual(pool_stats()["default"]["idle"], 1, msg)
+
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            row = cursor.fetchone()
+
+        msg = "Verifique se a próxima requisição reutiliza a conexão do pool"
+        self.assertEqual(row, (1,), msg)
+        self.assertIs(wrapper.connection, first, msg)
+        self.assertEqual(pool_stats()["default"]["created"], 1, msg)
+        self.assertEqual(pool_stats()["default"]["checkouts"], 2, msg)
+
+    def test_database_name_change_opens_a_new_pool(self):
+        wrapper = self.connections["default"]
+        wrapper.ensure_connection()
+        wrapper.close()
+
+        # What the test runner does when it creates the test database.
+        renamed = wrapper.settings_dict["NAME"].replace("pooled", "test_pooled")
+        wrapper.settings_dict["NAME"] = renamed
+        with wrapper.cursor() as cursor:
+            cursor.execute("PRAGMA database_list")
+            path = cursor.fetchone()[2]
+
+        msg = "Verifique se uma mudança de NAME abre conexões com o novo banco"
+        self.assertEqual(path, renamed, msg)
+        self.assertEqual(pool_stats()["default"]["created"], 1, msg)
@@ -0,0 +1,152 @@
+from django.core.cache import cache
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from albums.models import Album
+from bandkamp.cache import ALBUM_LIST_SCOPE, bump_generation
+from bandkamp.db.middleware import PIN_COOKIE, ReplicaRoutingMiddleware, pin_key
+from bandkamp.db.routers import is_pinned
+from tests.factories import create_multiple_albums_with_user, create_user_with_token
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class ReplicaRoutingMiddlewareTest(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.routes = []
+
+    def get_response(self, status_code=200):
+        def get_response(request):
+            self.routes.append((router.db_for_read(Album), is_pinned()))
+            return HttpResponse(status=status_code)
+
+        return get_response
+
+    def call(self, method, status_code=200, **extra):
+        middleware = ReplicaRoutingMiddleware(self.get_response(status_code))
+        request = getattr(self.factory, method)("/api/albums/", **extra)
+        return middleware(request)
+
+    def test_safe_requests_read_from_replicas(self):
+        self.call("get")
+        self.call("post")
+
+        msg = "Verifique se apenas requisições seguras leem das réplicas"
+        self.assertEqual(self.routes, [("replica_1", False), ("default", False)], msg)
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        authorization = {"HTTP_AUTHORIZATION": "Bearer writer"}
+        response = self.call("post", **authorization)
+        self.call("get", **authorization)
+        self.call("get", HTTP_AUTHORIZATION="Bearer someone-else")
+
+        msg = "Verifique se quem acabou de escrever lê do primário"
+        self.assertEqual(self.routes[1], ("default", True), msg)
+        self.assertEqual(self.routes[2], ("replica_1", False), msg)
+
+        msg = "Verifique se o cookie de fixação expira com a janela configurada"
+        self.assertEqual(response.cookies[PIN_COOKIE]["max-age"], 10, msg)
+
+    def test_pin_cookie_reads_from_the_primary(self):
+        request = self.factory.get("/api/albums/")
+        request.COOKIES[PIN_COOKIE] = "1"
+        ReplicaRoutingMiddleware(self.get_response())(request)
+
+        msg = "Verifique se o cookie de fixação faz a leitura ir ao primário"
+        self.assertEqual(self.routes, [("default", True)], msg)
+
+    def test_failed_writes_do_not_pin(self):
+        response = self.call("post", status_code=400, HTTP_AUTHORIZATION="Bearer x")
+        self.call("get", HTTP_AUTHORIZATION="Bearer x")
+
+        msg = "Verifique se uma escrita que falhou não fixa o cliente no primário"
+        self.assertNotIn(PIN_COOKIE, response.cookies, msg)
+        self.assertEqual(self.routes[1], ("replica_1", False), msg)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_reads_from_the_primary(self):
+        self.call("get")
+
+        msg = "Verifique se sem réplicas configuradas tudo lê do primário"
+        self.assertEqual(self.routes, [("default", False)], msg)
+
+    def test_reads_outside_requests_use_the_primary(self):
+        msg = "Verifique se leituras fora de requisições (comandos, threads) usam o primário"
+        self.assertEqual(router.db_for_read(Album), "default", msg)
+
+    def test_writes_always_use_the_primary(self):
+        msg = "Verifique se escritas sempre vão ao primário"
+        self.assertEqual(router.db_for_write(Album), "default", msg)
+        self.assertFalse(router.allow_migrate("replica_1", "albums"), msg)
+
+    async def test_async_requests_are_routed(self):
+        async def get_response(request):
+            self.routes.append((router.db_for_read(Album), is_pinned()))
+            return HttpResponse(status=201)
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        authorization = {"HTTP_AUTHORIZATION": "Bearer async-writer"}
+        await middleware(self.factory.post("/api/albums/", **authorization))
+        await middleware(self.factory.get("/api/albums/", **authorization))
+        await middleware(self.factory.get("/api/albums/"))
+
+        msg = "Verifique se o middleware também roteia as views assíncronas"
+        self.assertEqual(
+            self.routes,
+            [("default", False), ("default", True), ("replica_1", False)],
+            msg,
+        )
+
+
+# The primary doubles as the only "replica", so the views can run for real.
+@override_settings(DATABASE_REPLICAS=["default"])
+class ReadYourWritesTest(APITestCase):
+    BASE_URL = "/api/albums/"
+
+    def test_album_creation_pins_the_client(self):
+        _, token = create_user_with_token()
+        authorization = "Bearer " + str(token.access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=authorization)
+        response = self.client.post(
+            self.BASE_URL, data={"name": "Pinned", "year": 2000}, format="json"
+        )
+
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+        msg = "Verifique se criar um álbum fixa o cliente no primário"
+        self.assertIn(PIN_COOKIE, response.cookies, msg)
+        request = RequestFactory().get(self.BASE_URL, HTTP_AUTHORIZATION=authorization)
+        self.assertTrue(cache.get(pin_key(request)), msg)
+
+    def test_lagging_replica_reads_are_not_cached(self):
+        user, _ = create_user_with_token()
+        create_multiple_albums_with_user(user, 1)
+
+        # A write commits on the primary and bumps the generations, but the
+        # replica serving the next read has not applied it yet.
+        bump_generation(ALBUM_LIST_SCOPE, Album._meta.label_lower)
+        lagging = self.client.get(self.BASE_URL)
+
+        msg = "Verifique se respostas lidas de uma réplica não recebem ETag"
+        self.assertNotIn("ETag", lagging, msg)
+
+        # The replica catches up; nothing is bumped again.
+        Album.objects.bulk_create([Album(name="Written", year=2000, user=user)])
+
+        response = self.client.get(self.BASE_URL).json()
+        msg = (
+            "Verifique se a listagem e o `count` lidos de uma réplica atrasada "
+            + "não ficam em cache"
+        )
+        self.assertEqual(2, response["count"], msg)
+        self.assertIn("Written", [album["name"] for album in response["results"]], msg)
+
+        self.client.cookies[PIN_COOKIE] = "1"
+        with self.assertNumQueries(2):
+            self.client.get(self.BASE_URL)
+        with self.assertNumQueries(0):
+            pinned = self.client.get(self.BASE_URL)
+        msg = "Verifique se leituras no primário são cacheadas e recebem ETag"
+        self.assertIn("ETag", pinned, msg)
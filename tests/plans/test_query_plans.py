@@ -0,0 +1,134 @@
+import os
+from unittest import skipUnless
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from albums.models import Album
+from albums.views import AlbumView
+from bandkamp.counts import get_count
+from songs.models import Song
+from users.models import User
+from tests.factories import create_user_with_token
+from tests.query_plans import MAX_PLAN_ROWS, plan_problems
+
+USERS_COUNT = int(os.getenv("QUERY_PLAN_USERS", 200))
+ALBUMS_PER_USER = int(os.getenv("QUERY_PLAN_ALBUMS_PER_USER", 10))
+SONGS_IN_LARGE_ALBUM = int(os.getenv("QUERY_PLAN_LARGE_ALBUM_SONGS", 5000))
+
+
+class QueryPlanTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user, token = create_user_with_token()
+        cls.access_token = str(token.access_token)
+
+        password = make_password("1234")
+        users = User.objects.bulk_create(
+            User(
+                username=f"artist_{index}",
+                email=f"artist_{index}@kenziebuster.com",
+                artistic_name=f"Artist {index}",
+                password=password,
+            )
+            for index in range(USERS_COUNT)
+        )
+        albums = Album.objects.bulk_create(
+            Album(name=f"Album {index}", year=2000, user=user)
+            for user in users
+            for index in range(ALBUMS_PER_USER)
+        )
+        Song.objects.bulk_create(
+            Song(title="Single", duration=130, album=album) for album in albums
+        )
+
+        cls.large_album = albums[len(albums) // 2]
+        Song.objects.bulk_create(
+            Song(title=f"Track {index}", duration=130, album=cls.large_album)
+            for index in range(SONGS_IN_LARGE_ALBUM)
+        )
+        cls.prolific_user = users[len(users) // 2]
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+        # UnitTest Longer Logs
+        cls.maxDiff = None
+
+    def assertEfficientPlans(self, method: str, url: str, **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, **kwargs)
+            if response.streaming:
+                b"".join(response.streaming_content)
+
+        self.assertLess(response.status_code, 400)
+        problems = plan_problems(context.captured_queries)
+        msg = (
+            f"Verifique os índices usados pelo {method.upper()} em `{url}`: consultas "
+            + f"com varredura completa ou ordenação acima de {MAX_PLAN_ROWS} linhas"
+        )
+        self.assertDictEqual({}, problems, msg)
+
+    def test_albums_listing_plans(self):
+        self.assertEfficientPlans("get", "/api/albums/", data={"page": 500})
+        self.assertEfficientPlans("get", "/api/albums/", data={"pagination": "cursor"})
+        self.assertEfficientPlans("get", "/api/albums/", data={"include": "songs"})
+
+    def test_album_detail_plans(self):
+        self.assertEfficientPlans("get", f"/api/albums/{self.large_album.pk}/")
+
+    def test_songs_listing_plans(self):
+        url = f"/api/albums/{self.large_album.pk}/songs/"
+        self.assertEfficientPlans("get", url, data={"page": 100})
+        self.assertEfficientPlans("get", url, data={"pagination": "cursor"})
+
+    def test_export_by_user_plans(self):
+        self.assertEfficientPlans(
+            "get", "/api/albums/export/", data={"user": self.prolific_user.pk}
+        )
+
+    def test_user_registration_and_update_plans(self):
+        user_data = {
+            "username": "new_artist",
+            "email": "new_artist@kenziebuster.com",
+            "artistic_name": "New Artist",
+            "password": "1234",
+        }
+        self.assertEfficientPlans("post", "/api/users/", data=user_data, format="json")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token)
+        self.assertEfficientPlans(
+            "patch",
+            f"/api/users/{self.user.pk}/",
+            data={"email": "renamed@kenziebuster.com"},
+            format="json",
+        )
+
+    def test_selective_full_scans_are_reported(self):
+        with CaptureQueriesContext(connection) as context:
+            list(Album.objects.filter(name="Album 3").order_by("id")[:2])
+
+        msg = (
+            "Verifique se uma varredura completa filtrada é reportada mesmo "
+            + "retornando poucas linhas"
+        )
+        self.assertNotEqual({}, plan_problems(context.captured_queries), msg)
+
+    @skipUnless(connection.vendor == "postgresql", "only Postgres has estimates")
+    @override_settings(PAGINATION_COUNT_MODE="approximate")
+    def test_approximate_counts_of_filtered_listings(self):
+        albums = AlbumView.queryset.all()
+        with CaptureQueriesContext(connection) as context:
+            count = get_count(albums)
+
+        msg = "Verifique se a contagem aproximada de listagens filtradas usa o planner"
+        self.assertTrue(context.captured_queries[0]["sql"].startswith("EXPLAIN"), msg)
+        exact = albums.count()
+        self.assertAlmostEqual(exact, count, delta=exact / 10, msg=msg)
+
+        single = Album.objects.exclude(pk=self.large_album.pk).first()
+        msg = "Verifique se contagens pequenas continuam exatas"
+        self.assertEqual(1, get_count(Song.objects.filter(album=single)), msg)
@@ -0,0 +1,29 @@
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework.views import APIView
+
+
+@contextmanager
+def assert_query_budget(test_case: APITestCase, view: type[APIView], method: str):
+    # `method` may carry a variant of the request, e.g. "GET ?include=songs".
+    budget = view.query_budget[method]
+
+    with CaptureQueriesContext(connection) as context:
+        yield context
+
+    # Savepoints only exist because the test itself runs in a transaction.
+    captured = [
+        query
+        for query in context.captured_queries
+        if not query["sql"].startswith(("SAVEPOINT", "RELEASE SAVEPOINT"))
+    ]
+    executed = len(captured)
+    queries = "\n".join(query["sql"] for query in captured)
+    msg = (
+        f"Verifique se o {method} em `{view.__name__}` executa no máximo "
+        + f"{budget} queries (executou {executed}):\n{queries}"
+    )
+    test_case.assertLessEqual(executed, budget, msg)
@@ -0,0 +1,156 @@
+import json
+import os
+import re
+
+from django.db import connection
+
+# Full scans of tables larger than this, and sorts of more rows, fail.
+MAX_PLAN_ROWS = int(os.getenv("QUERY_PLAN_MAX_ROWS", 1000))
+
+# A full scan that keeps at least this fraction of the table is what the
+# planner should pick over an index; only more selective ones fail.
+MIN_SCAN_SELECTIVITY = float(os.getenv("QUERY_PLAN_MIN_SCAN_SELECTIVITY", 0.5))
+
+# Counting a whole table is inherently a full scan; pagination caches it.
+# Querysets with annotations are counted wrapped in a subquery.
+_UNFILTERED_COUNT = re.compile(r'^SELECT COUNT\(\*\) AS "__count" FROM "\w+"$')
+_WRAPPED_COUNT = re.compile(r"^SELECT COUNT\(\*\) FROM \((SELECT .*)\) subquery$")
+
+
+def _table_sizes() -> dict[str, int]:
+    sizes = {}
+    with connection.cursor() as cursor:
+        for table in connection.introspection.table_names(cursor):
+            cursor.execute(f'SELECT COUNT(*) FROM "{table}"')
+            sizes[table] = cursor.fetchone()[0]
+    return sizes
+
+
+def _relation_sizes() -> dict[str, int]:
+    # Planner estimates, refreshed by the ANALYZE the plan tests run.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relname, reltuples::bigint FROM pg_class "
+            "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+        )
+        return dict(cursor.fetchall())
+
+
+def _strip_subqueries(sql: str) -> str:
+    while re.search(r"\([^()]*\)", sql):
+        sql = re.sub(r"\([^()]*\)", "", sql)
+    return sql
+
+
+def _unfiltered_count(sql: str) -> bool:
+    if _UNFILTERED_COUNT.match(sql):
+        return True
+    wrapped = _WRAPPED_COUNT.match(sql)
+    return wrapped is not None and bool(
+        re.search(r' FROM "\w+"$', _strip_subqueries(wrapped.group(1)))
+    )
+
+
+def _bounded_rowid_scan(sql: str, table: str) -> bool:
+    # A scan in rowid order that nothing filters stops after the page LIMIT
+    # asks for; one with a WHERE on the table may read all of it first.
+    # Subqueries (correlated counts, IN lists) do not bound the outer scan.
+    sql = _strip_subqueries(sql)
+    if " LIMIT " not in sql:
+        return False
+    where = re.search(r" WHERE (.*?)(?: ORDER BY | LIMIT |$)", sql)
+    if where and f'"{table}".' in where.group(1):
+        return False
+    order = re.search(r" ORDER BY (.*?) LIMIT ", sql)
+    return order is None or order.group(1) in (
+        f'"{table}"."id" ASC',
+        f'"{table}"."id" DESC',
+    )
+
+
+def _sqlite_problems(sql: str, sizes: dict[str, int]) -> list[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        details = [row[3] for row in cursor.fetchall()]
+
+    # SQLite gives no row estimates, so any temporary sort is reported.
+    sorts = [detail for detail in details if detail.startswith("USE TEMP B-TREE")]
+    problems = [f"sort: {detail}" for detail in sorts]
+
+    for detail in details:
+        scan = re.match(r"SCAN (\w+)(?: AS \w+)?$", detail)
+        if not scan or sizes.get(scan.group(1), 0) <= MAX_PLAN_ROWS:
+            continue
+        if not sorts and _bounded_rowid_scan(sql, scan.group(1)):
+            continue
+        problems.append(f"full scan: {detail}")
+
+    return problems
+
+
+def _postgres_problems(sql: str, sizes: dict[str, int]) -> list[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+    problems = []
+    nodes = [(plan[0]["Plan"], None)]
+    while nodes:
+        node, parent = nodes.pop()
+        nodes.extend((child, node) for child in node.get("Plans", []))
+
+        # An index scan without an Index Cond walks the whole index, which is
+        # a full scan in index order.
+        full_scan = node["Node Type"] == "Seq Scan" or (
+            node["Node Type"] in ("Index Scan", "Index Only Scan")
+            and "Index Cond" not in node
+        )
+        if full_scan:
+            # Judged by the table it reads: a selective scan of a large table
+            # returns few rows but still reads all of them. Plan Rows is what
+            # the scan would return if its parent read it to the end.
+            size = sizes.get(node["Relation Name"], 0)
+            bounded = (
+                parent is not None
+                and parent["Node Type"] == "Limit"
+                and "Filter" not in node
+            )
+            selective = node["Plan Rows"] < size * MIN_SCAN_SELECTIVITY
+            if size > MAX_PLAN_ROWS and not bounded and selective:
+                problems.append(
+                    f"full scan: {node['Relation Name']} "
+                    + f"({node['Plan Rows']} of {size} rows)"
+                )
+        elif node["Node Type"] == "Sort" and node["Plan Rows"] > MAX_PLAN_ROWS:
+            problems.append(f"sort: {node['Sort Key']} ({node['Plan Rows']} rows)")
+
+    return problems
+
+
+def plan_problems(captured_queries: list[dict]) -> dict[str, list[str]]:
+    """
+    Runs EXPLAIN on every SELECT in `captured_queries` and returns the
+    offending plan nodes keyed by SQL.
+    """
+    if connection.vendor == "postgresql":
+        sizes = _relation_sizes()
+    else:
+        sizes = _table_sizes()
+    problems = {}
+
+    for query in captured_queries:
+        sql = query["sql"]
+        if not sql.startswith("SELECT") or _unfiltered_count(sql):
+            continue
+
+        if connection.vendor == "postgresql":
+            found = _postgres_problems(sql, sizes)
+        else:
+            found = _sqlite_problems(sql, sizes)
+
+        if found:
+            problems[sql] = found
+
+    return problems
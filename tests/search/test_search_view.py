@@ -0,0 +1,101 @@
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+from tests.factories import (
+    create_user_with_token,
+    create_album_with_user,
+    create_song_with_album,
+)
+
+
+class SearchViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.BASE_URL = "/api/search/"
+
+        cls.user, token = create_user_with_token()
+        cls.access_token = str(token.access_token)
+
+        cls.exact_album = create_album_with_user(
+            cls.user, {"name": "Shadows", "year": 2000}
+        )
+        cls.partial_album = create_album_with_user(
+            cls.user, {"name": "Shadows Collide with People and Other Stories", "year": 2004}
+        )
+        create_album_with_user(cls.user, {"name": "Unreachable", "year": 2001})
+        cls.song = create_song_with_album(
+            cls.user, {"title": "Song of Shadows", "duration": "130"}, cls.exact_album
+        )
+
+        # UnitTest Longer Logs
+        cls.maxDiff = None
+
+    def test_search_albums_ranked(self):
+        response = self.client.get(self.BASE_URL, {"q": "shadows"})
+
+        # STATUS CODE
+        expected_status_code = status.HTTP_200_OK
+        msg = (
+            "Verifique se o status code retornado do GET "
+            + f"em `{self.BASE_URL}` é {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+
+        # RETORNO ORDENADO POR RELEVÂNCIA
+        results = response.json()["results"]
+        returned_ids = [album["id"] for album in results]
+        expected_ids = [self.exact_album.id, self.partial_album.id]
+        msg = "Verifique se a busca retorna apenas os álbuns encontrados, do mais relevante ao menos"
+        self.assertListEqual(expected_ids, returned_ids, msg)
+        self.assertGreater(results[0]["rank"], results[1]["rank"], msg)
+
+    def test_search_songs_and_artists(self):
+        response = self.client.get(self.BASE_URL, {"q": "shadows", "type": "songs"})
+        returned_ids = [song["id"] for song in response.json()["results"]]
+        msg = "Verifique se `type=songs` busca pelo título das músicas"
+        self.assertListEqual([self.song.id], returned_ids, msg)
+
+        response = self.client.get(self.BASE_URL, {"q": "buster", "type": "artists"})
+        results = response.json()["results"]
+        msg = "Verifique se `type=artists` busca pelo nome artístico sem expor o email"
+        self.assertListEqual([self.user.id], [artist["id"] for artist in results], msg)
+        self.assertNotIn("email", results[0], msg)
+
+    def test_search_keyset_pagination(self):
+        for index in range(3):
+            create_album_with_user(self.user, {"name": f"Shadows {index}", "year": 2000})
+
+        response = self.client.get(self.BASE_URL, {"q": "shadows"})
+        resulted_data = response.json()
+        returned_ids = [album["id"] for album in resulted_data["results"]]
+        while resulted_data["next"]:
+            resulted_data = self.client.get(resulted_data["next"]).json()
+            returned_ids.extend(album["id"] for album in resulted_data["results"])
+
+        msg = "Verifique se os cursores da busca percorrem todos os resultados sem repetir"
+        self.assertEqual(5, len(returned_ids), msg)
+        self.assertEqual(5, len(set(returned_ids)), msg)
+
+    def test_search_sees_new_and_updated_rows(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token)
+        self.client.post("/api/albums/", {"name": "Hybrid Theory", "year": 2000}, format="json")
+        self.client.patch(
+            f"/api/users/{self.user.pk}/", {"artistic_name": "Linkin"}, format="json"
+        )
+
+        response = self.client.get(self.BASE_URL, {"q": "hybrid"})
+        msg = "Verifique se um álbum recém-criado é encontrado pela busca"
+        self.assertEqual(1, len(response.json()["results"]), msg)
+
+        response = self.client.get(self.BASE_URL, {"q": "linkin", "type": "artists"})
+        msg = "Verifique se o nome artístico atualizado é encontrado pela busca"
+        self.assertEqual(1, len(response.json()["results"]), msg)
+
+    def test_search_without_query(self):
+        response = self.client.get(self.BASE_URL)
+
+        expected_status_code = status.HTTP_400_BAD_REQUEST
+        msg = (
+            "Verifique se o GET sem `q` "
+            + f"em `{self.BASE_URL}` retorna {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
@@ -0,0 +1,86 @@
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+from tests.factories import create_user_with_token, create_album_with_user
+
+
+class TypeaheadViewTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.BASE_URL = "/api/search/typeahead/"
+
+        cls.user, token = create_user_with_token()
+        cls.access_token = str(token.access_token)
+
+        cls.album = create_album_with_user(
+            cls.user, {"name": "Shadows Collide with People", "year": 2004}
+        )
+        create_album_with_user(cls.user, {"name": "Ágora", "year": 2001})
+
+        # UnitTest Longer Logs
+        cls.maxDiff = None
+
+    def test_typeahead_completions_without_queries(self):
+        self.client.get(self.BASE_URL, {"q": "s"})
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.BASE_URL, {"q": "coll"})
+
+        # STATUS CODE
+        expected_status_code = status.HTTP_200_OK
+        msg = (
+            "Verifique se o status code retornado do GET "
+            + f"em `{self.BASE_URL}` é {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+
+        # RETORNO JSON
+        expected_data = {
+            "artists": [],
+            "albums": [{"id": self.album.id, "name": self.album.name}],
+        }
+        msg = "Verifique se o prefixo de qualquer palavra completa o nome do álbum"
+        self.assertDictEqual(expected_data, response.json(), msg)
+
+    def test_typeahead_ignores_case_and_accents(self):
+        response = self.client.get(self.BASE_URL, {"q": "AGO"})
+        returned_names = [album["name"] for album in response.json()["albums"]]
+        msg = "Verifique se a busca por prefixo ignora maiúsculas e acentos"
+        self.assertListEqual(["Ágora"], returned_names, msg)
+
+        response = self.client.get(self.BASE_URL, {"q": "bus"})
+        returned_ids = [artist["id"] for artist in response.json()["artists"]]
+        msg = "Verifique se os nomes artísticos também são completados"
+        self.assertListEqual([self.user.id], returned_ids, msg)
+
+    def test_typeahead_follows_writes(self):
+        self.client.get(self.BASE_URL, {"q": "s"})
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token)
+        self.client.post(
+            "/api/albums/",
+            [{"name": "Hybrid Theory", "year": 2000}, {"name": "Meteora", "year": 2003}],
+            format="json",
+        )
+        self.client.patch(
+            f"/api/users/{self.user.pk}/", {"artistic_name": "Linkin"}, format="json"
+        )
+
+        response = self.client.get(self.BASE_URL, {"q": "hyb"})
+        msg = "Verifique se álbuns criados em lote aparecem no autocompletar"
+        self.assertEqual(1, len(response.json()["albums"]), msg)
+
+        response = self.client.get(self.BASE_URL, {"q": "bus"})
+        msg = "Verifique se o nome artístico antigo deixa de ser sugerido"
+        self.assertListEqual([], response.json()["artists"], msg)
+
+        response = self.client.get(self.BASE_URL, {"q": "link"})
+        msg = "Verifique se o nome artístico novo passa a ser sugerido"
+        self.assertEqual(1, len(response.json()["artists"]), msg)
+
+    def test_typeahead_limit(self):
+        for index in range(5):
+            create_album_with_user(self.user, {"name": f"Live {index}", "year": 2000})
+
+        response = self.client.get(self.BASE_URL, {"q": "live", "limit": 3})
+        msg = "Verifique se `limit` restringe o número de sugestões"
+        self.assertEqual(3, len(response.json()["albums"]), msg)
@@ -0,0 +1,62 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class DurationSecondsMigrationTest(TransactionTestCase):
+    before = [("songs", "0001_initial")]
+    after = [("songs", "0002_song_duration_seconds")]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        self.apps = self.state_apps(executor, self.before)
+        self.addCleanup(self.migrate_to_latest)
+
+    def state_apps(self, executor, targets):
+        # Songs goes back in time (with search, which depends on it); users and
+        # albums stay migrated.
+        others = [
+            node
+            for node in executor.loader.graph.leaf_nodes()
+            if node[0] in ("users", "albums")
+        ]
+        return executor.loader.project_state(targets + others).apps
+
+    def migrate_to_latest(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def create_song(self, duration):
+        User = self.apps.get_model("users", "User")
+        Album = self.apps.get_model("albums", "Album")
+        Song = self.apps.get_model("songs", "Song")
+
+        user, _ = User.objects.get_or_create(
+            username="legacy", defaults={"email": "legacy@kenziebuster.com"}
+        )
+        album = Album.objects.create(name="Legacy", year=2000, user=user)
+        return Song.objects.create(title="Legacy", duration=duration, album=album)
+
+    def test_converts_legacy_durations(self):
+        song = self.create_song("2:10")
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        Song = self.state_apps(executor, self.after).get_model("songs", "Song")
+
+        msg = "Verifique se a migração converte durações textuais em segundos"
+        self.assertEqual(130, Song.objects.get(pk=song.pk).duration, msg)
+
+    def test_refuses_unparseable_durations(self):
+        song = self.create_song("forever")
+
+        msg = "Verifique se a migração falha listando as durações que não entende"
+        with self.assertRaisesMessage(ValueError, f"{song.pk}: 'forever'", msg=msg):
+            MigrationExecutor(connection).migrate(self.after)
+
+        Song = self.apps.get_model("songs", "Song")
+        msg = "Verifique se a duração original é preservada"
+        self.assertEqual("forever", Song.objects.get(pk=song.pk).duration, msg)
+
+        Song.objects.filter(pk=song.pk).delete()
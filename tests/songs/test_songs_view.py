@@ -1,3 +1,6 @@
+import json
+
+from django.test import override_settings
 from rest_framework.test import APITestCase
 from rest_framework.views import status
 from tests.factories import (
@@ -5,6 +8,8 @@ from tests.factories import (
     create_album_with_user,
     create_multiple_songs_with_album,
 )
+from tests.query_budget import assert_query_budget
+from songs.views import SongView
 import ipdb
 
 
@@ -45,6 +50,89 @@ class SongViewTest(APITestCase):
         )
         self.assertEqual(expected_len, results_len, msg)
 
+    def test_songs_listing_query_budget(self):
+        create_multiple_songs_with_album(
+            user=self.user, songs_count=10, album=self.album
+        )
+
+        with assert_query_budget(self, SongView, "GET"):
+            response = self.client.get(self.BASE_URL)
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+
+    def test_songs_listing_keyset_pagination(self):
+        songs = create_multiple_songs_with_album(
+            user=self.user, songs_count=5, album=self.album
+        )
+
+        response = self.client.get(self.BASE_URL, {"pagination": "cursor"})
+        resulted_data = response.json()
+
+        # RETORNO CHAVES
+        expected_pagination_keys = {"next", "previous", "results"}
+        msg = "Verifique se a paginação por cursor não retorna `count`"
+        self.assertSetEqual(expected_pagination_keys, set(resulted_data.keys()), msg)
+
+        # SEGUNDA PÁGINA
+        response = self.client.get(resulted_data["next"])
+        returned_ids = [song["id"] for song in response.json()["results"]]
+        expected_ids = [song.id for song in songs[2:4]]
+        msg = f"Verifique se o cursor `next` retorna a página seguinte em {self.BASE_URL}"
+        self.assertListEqual(expected_ids, returned_ids, msg)
+
+    def test_songs_listing_response_is_cached(self):
+        create_multiple_songs_with_album(user=self.user, songs_count=1, album=self.album)
+        self.client.get(self.BASE_URL)
+
+        with self.assertNumQueries(0):
+            self.client.get(self.BASE_URL)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token)
+        song_data = {"title": "Unreachable", "duration": "130"}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.BASE_URL, data=song_data, format="json")
+
+        response = self.client.get(self.BASE_URL)
+        msg = f"Verifique se a listagem em {self.BASE_URL} é invalidada ao criar uma música"
+        self.assertEqual(2, response.json()["count"], msg)
+
+    def test_songs_listing_conditional_get(self):
+        create_multiple_songs_with_album(user=self.user, songs_count=3, album=self.album)
+        response = self.client.get(self.BASE_URL)
+        etag = response["ETag"]
+
+        # NÃO MODIFICADO
+        with self.assertNumQueries(0):
+            response = self.client.get(self.BASE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        expected_status_code = status.HTTP_304_NOT_MODIFIED
+        msg = (
+            "Verifique se o GET com `If-None-Match` atual "
+            + f"em `{self.BASE_URL}` retorna {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+
+        # MODIFICADO
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token)
+        song_data = {"title": "Unreachable", "duration": "130"}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.BASE_URL, data=song_data, format="json")
+        self.client.credentials()
+
+        response = self.client.get(self.BASE_URL, HTTP_IF_NONE_MATCH=etag)
+        msg = f"Verifique se o ETag em `{self.BASE_URL}` muda após criar uma música"
+        self.assertEqual(status.HTTP_200_OK, response.status_code, msg)
+        self.assertNotEqual(etag, response["ETag"], msg)
+
+    def test_song_creation_query_budget(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token)
+        song_data = {"title": "Unreachable", "duration": "130"}
+
+        with assert_query_budget(self, SongView, "POST"):
+            response = self.client.post(self.BASE_URL, data=song_data, format="json")
+
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+
     def test_song_creation_without_required_fields(self):
         self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token)
         response = self.client.post(self.BASE_URL, data={}, format="json")
@@ -110,3 +198,126 @@ class SongViewTest(APITestCase):
             + f"em `{self.BASE_URL}` é {expected_status_code}"
         )
         self.assertEqual(expected_status_code, result_status_code, msg)
+
+    def test_bulk_song_creation_with_json_array(self):
+        songs_data = [
+            {"title": f"Song {index}", "duration": f"1{index}"} for index in range(3)
+        ]
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token)
+        response = self.client.post(self.BASE_URL, data=songs_data, format="json")
+
+        # STATUS CODE
+        expected_status_code = status.HTTP_201_CREATED
+        msg = (
+            "Verifique se o status code retornado do POST em lote "
+            + f"em `{self.BASE_URL}` é {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+
+        # RETORNO JSON
+        returned_titles = [song["title"] for song in response.json()]
+        expected_titles = [song["title"] for song in songs_data]
+        msg = "Verifique se todas as músicas do lote são retornadas na ordem enviada"
+        self.assertListEqual(expected_titles, returned_titles, msg)
+
+    @override_settings(SONG_IMPORT_CHUNK_SIZE=2)
+    def test_bulk_song_creation_with_ndjson_stream(self):
+        self.client.get(self.BASE_URL)
+        lines = [
+            json.dumps({"title": f"Song {index}", "duration": f"1{index}"})
+            for index in range(5)
+        ]
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token)
+        response = self.client.post(
+            self.BASE_URL,
+            data="\n".join(lines) + "\n",
+            content_type="application/x-ndjson",
+        )
+
+        # STATUS CODE
+        expected_status_code = status.HTTP_201_CREATED
+        msg = (
+            "Verifique se o status code retornado do POST em NDJSON "
+            + f"em `{self.BASE_URL}` é {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+        self.assertDictEqual({"count": 5}, response.json())
+
+        # LISTAGEM ATUALIZADA
+        response = self.client.get(self.BASE_URL)
+        msg = "Verifique se a listagem é invalidada após a importação em NDJSON"
+        self.assertEqual(5, response.json()["count"], msg)
+
+    @override_settings(SONG_IMPORT_CHUNK_SIZE=2)
+    def test_bulk_song_creation_with_invalid_ndjson_line(self):
+        lines = [
+            json.dumps({"title": "Song 1", "duration": "11"}),
+            json.dumps({"title": "Song 2", "duration": "12"}),
+            "",
+            json.dumps({"title": "Song 3"}),
+        ]
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token)
+        response = self.client.post(
+            self.BASE_URL,
+            data="\n".join(lines),
+            content_type="application/x-ndjson",
+        )
+
+        # STATUS CODE
+        expected_status_code = status.HTTP_400_BAD_REQUEST
+        msg = (
+            "Verifique se o POST em NDJSON com uma linha inválida "
+            + f"em `{self.BASE_URL}` retorna {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+
+        # RETORNO JSON
+        expected_data = {"4": {"duration": ["This field is required."]}}
+        msg = "Verifique se o erro indica a linha inválida do NDJSON"
+        self.assertDictEqual(expected_data, response.json(), msg)
+
+        response = self.client.get(self.BASE_URL)
+        msg = "Verifique se nenhuma música é criada quando uma linha é inválida"
+        self.assertEqual(0, response.json()["count"], msg)
+
+    def test_song_creation_with_textual_duration(self):
+        song_data = {"title": "Unreachable", "duration": "2:10"}
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token)
+        response = self.client.post(self.BASE_URL, data=song_data, format="json")
+
+        # DURAÇÃO EM SEGUNDOS
+        msg = "Verifique se a duração é armazenada e retornada em segundos"
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code, msg)
+        self.assertEqual("130", response.json()["duration"], msg)
+
+    def test_song_creation_with_invalid_duration(self):
+        song_data = {"title": "Unreachable", "duration": "forever"}
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token)
+        response = self.client.post(self.BASE_URL, data=song_data, format="json")
+
+        expected_status_code = status.HTTP_400_BAD_REQUEST
+        msg = (
+            "Verifique se o POST com duração inválida "
+            + f"em `{self.BASE_URL}` retorna {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+        self.assertSetEqual({"duration"}, set(response.json().keys()), msg)
+
+    def test_song_creation_with_too_long_duration(self):
+        song_data = {"title": "Unreachable", "duration": "2147483648"}
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token)
+        response = self.client.post(self.BASE_URL, data=song_data, format="json")
+
+        expected_status_code = status.HTTP_400_BAD_REQUEST
+        msg = (
+            "Verifique se o POST com duração maior que a coluna suporta "
+            + f"em `{self.BASE_URL}` retorna {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+        self.assertSetEqual({"duration"}, set(response.json().keys()), msg)
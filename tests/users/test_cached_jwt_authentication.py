@@ -0,0 +1,139 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from bandkamp.cache import bump_generation, get_generation, user_scope
+from bandkamp.db.routers import read_from
+from tests.factories import create_user_with_token
+from users import authentication
+from users.authentication import CachedJWTAuthentication, TokenCache
+
+
+@override_settings(JWT_AUTH_CACHE=True)
+class CachedJWTAuthenticationTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user, token = create_user_with_token()
+        cls.access_token = str(token.access_token)
+        cls.BASE_URL = f"/api/users/{cls.user.id}/"
+
+    def authenticate(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token)
+        return self.client.get(self.BASE_URL)
+
+    def patch_user(self, data: dict):
+        return self.client.patch(self.BASE_URL, data, format="json")
+
+    def test_repeated_token_skips_user_query(self):
+        self.authenticate()
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.BASE_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        executed = len(context.captured_queries)
+        msg = (
+            "Verifique se um token já validado não busca o usuário de novo "
+            + f"(executou {executed} queries, esperado 1 do próprio GET)"
+        )
+        self.assertEqual(executed, 1, msg)
+
+    def test_profile_update_refreshes_cached_user(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.patch_user({"artistic_name": "Renomeado"})
+
+        cached = authentication.tokens.get(self.access_token.encode())
+        msg = "Verifique se atualizar o usuário invalida o token em cache"
+        self.assertIsNone(cached, msg)
+
+    def test_deactivated_user_is_rejected(self):
+        self.authenticate()
+
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        response = self.patch_user({"full_name": "Inativo"})
+
+        expected_status_code = status.HTTP_401_UNAUTHORIZED
+        msg = (
+            "Verifique se um usuário desativado deixa de ser autenticado "
+            + "pelo token em cache"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+
+    def test_deleted_user_is_rejected(self):
+        self.authenticate()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        response = self.client.get("/api/albums/export/")
+
+        expected_status_code = status.HTTP_401_UNAUTHORIZED
+        msg = "Verifique se um usuário deletado deixa de ser autenticado"
+        self.assertEqual(expected_status_code, response.status_code, msg)
+
+    def test_cached_user_is_a_snapshot(self):
+        self.authenticate()
+
+        cached_user, _ = authentication.tokens.get(self.access_token.encode())
+        msg = "Verifique se o cache guarda o usuário autenticado"
+        self.assertEqual(cached_user.pk, self.user.pk, msg)
+
+        response = self.client.get(self.BASE_URL)
+        msg = "Verifique se a view recebe uma cópia do usuário em cache"
+        self.assertIsNot(response.wsgi_request.user, cached_user, msg)
+
+    def test_token_cache_is_bounded(self):
+        tokens = TokenCache(maxsize=2, ttl=60)
+        validated_token = {"exp": 2**40}
+        generation = get_generation(user_scope(self.user.pk))
+        for raw_token in (b"a", b"b", b"c"):
+            tokens.set(raw_token, self.user, validated_token, generation)
+
+        msg = "Verifique se o cache descarta o token usado há mais tempo"
+        self.assertEqual(len(tokens), 2, msg)
+        self.assertIsNone(tokens.get(b"a"), msg)
+        self.assertIsNotNone(tokens.get(b"c"), msg)
+
+    def test_user_written_while_loading_is_not_cached(self):
+        get_user = CachedJWTAuthentication.get_user
+
+        def get_user_then_deactivate(authenticator, validated_token):
+            user = get_user(authenticator, validated_token)
+            # Lands between loading the user and caching it.
+            bump_generation(user_scope(user.pk))
+            return user
+
+        with mock.patch.object(
+            CachedJWTAuthentication, "get_user", get_user_then_deactivate
+        ):
+            self.authenticate()
+
+        msg = "Verifique se um usuário alterado durante a autenticação não fica em cache"
+        self.assertIsNone(authentication.tokens.get(self.access_token.encode()), msg)
+
+    def test_cached_user_is_loaded_from_the_primary(self):
+        request = RequestFactory().get(
+            self.BASE_URL, HTTP_AUTHORIZATION="Bearer " + self.access_token
+        )
+        # The alias is not configured: any query routed to it would fail.
+        with read_from("lagging_replica"):
+            user, _ = CachedJWTAuthentication().authenticate(request)
+
+        msg = "Verifique se o usuário que vai para o cache é lido do primário"
+        self.assertEqual(user.pk, self.user.pk, msg)
+
+    @override_settings(JWT_AUTH_CACHE=False)
+    def test_cache_is_off_without_a_shared_cache(self):
+        self.authenticate()
+
+        msg = (
+            "Verifique se, sem cache compartilhado, os tokens não ficam em cache "
+            + "(a invalidação não alcançaria os outros processos)"
+        )
+        self.assertEqual(len(authentication.tokens), 0, msg)
@@ -0,0 +1,145 @@
+import threading
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework.views import status
+
+from tests.factories import create_user_with_token
+from users.hashing import HashingExecutor, PasswordHashingUnavailable
+from users.models import User
+
+
+class AsyncUserViewsTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user, _ = create_user_with_token()
+        cls.LOGIN_URL = "/api/async/users/login/"
+        cls.REGISTER_URL = "/api/async/users/"
+
+    async def test_async_login(self):
+        response = await self.async_client.post(
+            self.LOGIN_URL,
+            {"username": self.user.username, "password": "1234"},
+            content_type="application/json",
+        )
+
+        expected_status_code = status.HTTP_200_OK
+        msg = (
+            "Verifique se o status code retornado do POST com credenciais "
+            + f"corretas em `{self.LOGIN_URL}` é {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+
+        msg = "Verifique se o login assíncrono retorna os mesmos tokens do síncrono"
+        self.assertSetEqual({"refresh", "access"}, set(response.json()), msg)
+
+    async def test_async_login_with_wrong_credentials(self):
+        for username in (self.user.username, "nao_existe"):
+            response = await self.async_client.post(
+                self.LOGIN_URL,
+                {"username": username, "password": "errada"},
+                content_type="application/json",
+            )
+
+            expected_status_code = status.HTTP_401_UNAUTHORIZED
+            msg = (
+                "Verifique se o status code retornado do POST com credenciais "
+                + f"erradas em `{self.LOGIN_URL}` é {expected_status_code}"
+            )
+            self.assertEqual(expected_status_code, response.status_code, msg)
+
+    async def test_async_login_without_required_fields(self):
+        response = await self.async_client.post(
+            self.LOGIN_URL, {}, content_type="application/json"
+        )
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        msg = "Verifique se todas as chaves obrigatórias são retornadas"
+        self.assertSetEqual({"username", "password"}, set(response.json()), msg)
+
+    async def test_async_registration(self):
+        user_data = {
+            "username": "async_buster",
+            "email": "async_buster@kenziebuster.com",
+            "artistic_name": "Async",
+            "password": "1234",
+        }
+        response = await self.async_client.post(
+            self.REGISTER_URL, user_data, content_type="application/json"
+        )
+
+        expected_status_code = status.HTTP_201_CREATED
+        msg = (
+            "Verifique se o status code retornado do POST em "
+            + f"`{self.REGISTER_URL}` é {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+        self.assertNotIn("password", response.json())
+
+        user = await sync_to_async(User.objects.get)(username="async_buster")
+        msg = "Verifique se a senha do usuário registrado foi hasheada"
+        self.assertTrue(user.check_password("1234"), msg)
+
+    async def test_async_registration_with_duplicate_username(self):
+        response = await self.async_client.post(
+            self.REGISTER_URL,
+            {
+                "username": self.user.username,
+                "email": "outro@kenziebuster.com",
+                "artistic_name": "Outro",
+                "password": "1234",
+            },
+            content_type="application/json",
+        )
+
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        msg = "Verifique se o username duplicado é rejeitado"
+        self.assertIn("username", response.json(), msg)
+
+
+@override_settings(
+    PASSWORD_HASHING_WORKERS=1,
+    PASSWORD_HASHING_QUEUE_DEPTH=0,
+    # Long enough for a loaded CI machine to hand the slot back after release.
+    PASSWORD_HASHING_QUEUE_TIMEOUT=1,
+)
+class HashingExecutorTest(APITestCase):
+    def test_full_queue_is_rejected(self):
+        executor = HashingExecutor()
+        release = threading.Event()
+        blocker = executor.submit(release.wait)
+
+        try:
+            with self.assertRaises(PasswordHashingUnavailable):
+                executor.submit(sum, [], wait=False)
+        finally:
+            release.set()
+        blocker.result()
+
+        msg = "Verifique se o executor volta a aceitar senhas após liberar a fila"
+        self.assertEqual(executor.run(sum, [1, 2]), 3, msg)
+
+    def test_login_answers_503_when_hashing_is_saturated(self):
+        user, _ = create_user_with_token()
+        executor = HashingExecutor()
+        release = threading.Event()
+        executor.submit(release.wait)
+
+        try:
+            with mock.patch("users.hashing.executor", executor):
+                response = self.client.post(
+                    "/api/users/login/",
+                    {"username": user.username, "password": "1234"},
+                    format="json",
+                )
+        finally:
+            release.set()
+
+        expected_status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        msg = (
+            "Verifique se o login responde "
+            + f"{expected_status_code} quando a fila de hashing está cheia"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
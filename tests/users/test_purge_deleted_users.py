@@ -0,0 +1,141 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from albums.models import Album
+from songs.models import Song
+from tests.factories import (
+    create_multiple_albums_with_user,
+    create_multiple_songs_with_album,
+    create_user_with_token,
+)
+from users.deletion import purge_user, request_deletion
+from users.models import User
+
+
+class PurgeDeletedUsersTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user, _ = create_user_with_token()
+        for album in create_multiple_albums_with_user(cls.user, 3):
+            create_multiple_songs_with_album(cls.user, 4, album=album)
+
+        cls.other_user, _ = create_user_with_token(
+            {
+                "username": "outro",
+                "email": "outro@kenziebuster.com",
+                "artistic_name": "Outro",
+                "password": "1234",
+            }
+        )
+        create_multiple_songs_with_album(cls.other_user, 2)
+
+    def test_purge_deletes_catalog_in_batches(self):
+        request_deletion(self.user)
+        batches = []
+
+        purged = purge_user(
+            self.user.pk, batch_size=5, progress=lambda *batch: batches.append(batch)
+        )
+
+        msg = "Verifique se o usuário e seu catálogo são removidos"
+        self.assertTrue(purged, msg)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists(), msg)
+        self.assertFalse(Album.objects.filter(user=self.user).exists(), msg)
+
+        msg = "Verifique se a remoção acontece em lotes limitados"
+        self.assertListEqual(
+            batches,
+            [("songs", 5), ("songs", 5), ("songs", 2), ("albums", 3)],
+            msg,
+        )
+
+        msg = "Verifique se o catálogo de outros usuários é preservado"
+        other_songs = Song.objects.filter(album__user=self.other_user)
+        self.assertEqual(other_songs.count(), 2, msg)
+
+    def test_purge_ignores_users_without_deletion_request(self):
+        msg = "Verifique se apenas usuários com remoção solicitada são removidos"
+        self.assertFalse(purge_user(self.user.pk), msg)
+        self.assertTrue(User.objects.filter(pk=self.user.pk).exists(), msg)
+
+    def test_command_status_and_purge(self):
+        request_deletion(self.user)
+
+        output = StringIO()
+        call_command("purge_deleted_users", "--status", stdout=output)
+        msg = "Verifique se o status mostra o que falta remover"
+        self.assertIn("3 albums, 12 songs left", output.getvalue(), msg)
+        self.assertTrue(User.objects.filter(pk=self.user.pk).exists(), msg)
+
+        output = StringIO()
+        call_command("purge_deleted_users", "--batch-size", "10", stdout=output)
+        msg = "Verifique se o comando conclui remoções pendentes"
+        self.assertIn(f"User {self.user.pk} purged.", output.getvalue(), msg)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists(), msg)
+
+
+class PendingDeletionVisibilityTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user, _ = create_user_with_token()
+        cls.album = create_multiple_albums_with_user(cls.user, 1)[0]
+        create_multiple_songs_with_album(cls.user, 2, album=cls.album)
+
+    def test_pending_catalog_is_hidden_before_the_purge(self):
+        urls = [
+            "/api/albums/",
+            f"/api/albums/{self.album.pk}/songs/",
+            "/api/search/typeahead/",
+        ]
+        for url in urls:
+            self.client.get(url, {"q": self.album.name})
+
+        # The background purge is best effort; here it never runs.
+        with mock.patch("users.deletion.start_purge"):
+            with self.captureOnCommitCallbacks(execute=True):
+                request_deletion(self.user)
+
+        msg = "Verifique se os álbuns de quem pediu exclusão somem da listagem"
+        self.assertEqual(0, self.client.get("/api/albums/").json()["count"], msg)
+
+        response = self.client.get(f"/api/albums/{self.album.pk}/")
+        msg = "Verifique se o álbum de quem pediu exclusão não é mais encontrado"
+        self.assertEqual(404, response.status_code, msg)
+
+        response = self.client.get(f"/api/albums/{self.album.pk}/songs/")
+        msg = "Verifique se as músicas de quem pediu exclusão somem da listagem"
+        self.assertEqual(0, response.json()["count"], msg)
+
+        searches = {"albums": "Algum", "songs": "Song", "artists": "Buster"}
+        for search_type, query in searches.items():
+            response = self.client.get("/api/search/", {"q": query, "type": search_type})
+            msg = f"Verifique se a busca por {search_type} ignora quem pediu exclusão"
+            self.assertListEqual([], response.json()["results"], msg)
+
+        response = self.client.get("/api/albums/export/")
+        msg = "Verifique se a exportação não inclui o catálogo pendente de exclusão"
+        self.assertEqual(b"", b"".join(response.streaming_content), msg)
+
+    def test_deletion_request_does_not_read_the_catalog(self):
+        create_multiple_albums_with_user(self.user, 5)
+
+        with mock.patch("users.deletion.start_purge"):
+            # Only the UPDATE of the user, however large the catalog.
+            with self.assertNumQueries(1):
+                request_deletion(self.user)
+
+    def test_purge_removes_albums_from_typeahead(self):
+        self.client.get("/api/search/typeahead/", {"q": self.album.name})
+
+        with mock.patch("users.deletion.start_purge"):
+            with self.captureOnCommitCallbacks(execute=True):
+                request_deletion(self.user)
+        purge_user(self.user.pk)
+
+        response = self.client.get("/api/search/typeahead/", {"q": self.album.name})
+        msg = "Verifique se o autocompletar deixa de sugerir os álbuns apagados"
+        self.assertListEqual([], response.json()["albums"], msg)
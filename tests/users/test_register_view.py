@@ -2,6 +2,8 @@ from rest_framework.test import APITestCase
 from rest_framework.views import status
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractUser
+from tests.query_budget import assert_query_budget
+from users.views import UserView
 
 
 User: AbstractUser = get_user_model()
@@ -125,3 +127,41 @@ class UserRegistrationViewTest(APITestCase):
             + f"em `{self.BASE_URL}` é {expected_status_code}"
         )
         self.assertEqual(expected_status_code, result_status_code, msg)
+
+    def test_user_creation_query_budget(self):
+        user_data = {
+            "username": "lucira",
+            "email": "lucira@mail.com",
+            "artistic_name": "Buster",
+            "password": "1234",
+        }
+
+        with assert_query_budget(self, UserView, "POST"):
+            response = self.client.post(self.BASE_URL, data=user_data, format="json")
+
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+
+    def test_non_unique_email_only_user_creation(self):
+        user_data = {
+            "username": "lucira",
+            "email": "lucira@mail.com",
+            "artistic_name": "Buster",
+            "password": "1234",
+        }
+        User.objects.create_user(**user_data)
+        response = self.client.post(
+            self.BASE_URL, data={**user_data, "username": "outra"}, format="json"
+        )
+
+        # STATUS CODE
+        expected_status_code = status.HTTP_400_BAD_REQUEST
+        msg = (
+            "Verifique se o status code retornado do POST com email repetido "
+            + f"em `{self.BASE_URL}` é {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+
+        # RETORNO JSON
+        expected_data = {"email": ["This field must be unique."]}
+        msg = "Verifique se apenas o campo repetido é apontado no erro"
+        self.assertDictEqual(expected_data, response.json(), msg)
@@ -1,7 +1,11 @@
+from unittest import mock
+
 from rest_framework.test import APITestCase
 from rest_framework.views import status
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from tests.factories import create_user_with_token
 
 
@@ -84,6 +88,32 @@ class UserDetailViewsTest(APITestCase):
         )
         self.assertDictEqual(expected_data, resulted_data, msg)
 
+    def test_retrieve_user_conditional_get(self):
+        response = self.client.get(self.BASE_URL, format="json")
+        etag = response["ETag"]
+
+        # NÃO MODIFICADO
+        with self.assertNumQueries(0):
+            response = self.client.get(self.BASE_URL, HTTP_IF_NONE_MATCH=etag)
+
+        expected_status_code = status.HTTP_304_NOT_MODIFIED
+        msg = (
+            "Verifique se o GET com `If-None-Match` atual "
+            + f"em `{self.BASE_URL}` retorna {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+
+        # MODIFICADO
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token_1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.BASE_URL, data={"full_name": "Lucy"}, format="json")
+        self.client.credentials()
+
+        response = self.client.get(self.BASE_URL, HTTP_IF_NONE_MATCH=etag)
+        msg = f"Verifique se o ETag em `{self.BASE_URL}` muda após atualizar o usuário"
+        self.assertEqual(status.HTTP_200_OK, response.status_code, msg)
+        self.assertEqual("Lucy", response.json()["full_name"], msg)
+
     def test_delete_user_without_token(self):
         response = self.client.delete(self.BASE_URL, format="json")
 
@@ -223,3 +253,91 @@ class UserDetailViewsTest(APITestCase):
 
         # ipdb.set_trace()
         self.assertTrue(user.check_password(info_to_patch["password"]), msg)
+
+    def test_update_user_with_taken_username(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token_1)
+        response = self.client.patch(
+            self.BASE_URL, {"username": self.user_2.username}, format="json"
+        )
+
+        # STATUS CODE
+        expected_status_code = status.HTTP_400_BAD_REQUEST
+        msg = (
+            "Verifique se o status code retornado do PATCH com username repetido "
+            + f"em `{self.BASE_URL}` é {expected_status_code}"
+        )
+        self.assertEqual(expected_status_code, response.status_code, msg)
+
+        # RETORNO JSON
+        expected_data = {"username": ["A user with that username already exists."]}
+        msg = "Verifique a mensagem de erro ao atualizar para um username repetido"
+        self.assertDictEqual(expected_data, response.json(), msg)
+
+    def test_update_user_writes_only_changed_fields(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token_1)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(
+                self.BASE_URL, {"full_name": "Outro Nome"}, format="json"
+            )
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        updates = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+        msg = "Verifique se o PATCH executa um único UPDATE"
+        self.assertEqual(len(updates), 1, msg)
+
+        msg = "Verifique se o PATCH atualiza apenas a coluna alterada"
+        self.assertIn('"full_name"', updates[0], msg)
+        self.assertNotIn('"password"', updates[0], msg)
+        self.assertNotIn('"email"', updates[0], msg)
+
+    def test_update_user_without_changes_skips_write(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token_1)
+        data = {"full_name": self.user_1.full_name, "username": self.user_1.username}
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(self.BASE_URL, data, format="json")
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        updates = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+        msg = "Verifique se o PATCH sem alterações não executa UPDATE"
+        self.assertListEqual(updates, [], msg)
+
+    def test_update_user_password(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token_1)
+        response = self.client.patch(self.BASE_URL, {"password": "nova"}, format="json")
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.user_1.refresh_from_db()
+        msg = "Verifique se o PATCH com senha atualiza o hash da senha"
+        self.assertTrue(self.user_1.check_password("nova"), msg)
+
+    def test_delete_user_deactivates_and_schedules_purge(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer " + self.access_token_1)
+
+        with mock.patch("users.deletion.start_purge") as start_purge:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(self.BASE_URL, format="json")
+
+        self.assertEqual(status.HTTP_204_NO_CONTENT, response.status_code)
+
+        self.user_1.refresh_from_db()
+        msg = "Verifique se o usuário é desativado imediatamente no DELETE"
+        self.assertFalse(self.user_1.is_active, msg)
+        self.assertIsNotNone(self.user_1.deletion_requested_at, msg)
+
+        msg = "Verifique se a remoção do catálogo é agendada após o commit"
+        start_purge.assert_called_once_with(self.user_1.pk)
+
+        self.client.credentials()
+        response = self.client.get(self.BASE_URL, format="json")
+        msg = "Verifique se o usuário em remoção não é mais retornado"
+        self.assertEqual(status.HTTP_404_NOT_FOUND, response.status_code, msg)
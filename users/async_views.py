@@ -0,0 +1,58 @@
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from bandkamp.async_views import async_api_view, render
+from .hashing import acheck_password, amake_password
+from .models import User
+from .serializers import UserSerializer
+
+
+@async_api_view(["POST"])
+async def user_create(request):
+    # Same contract as `UserView`, but the password is hashed on the bounded
+    # executor while the event loop keeps serving other requests.
+    serializer = UserSerializer(data=request.data)
+    if not await sync_to_async(serializer.is_valid)():
+        raise ValidationError(serializer.errors)
+
+    data = dict(serializer.validated_data)
+    password = await amake_password(data.pop("password"))
+    user = User(**data, password=password)
+    user.clean()
+
+    def save():
+        with serializer.unique_violations(data):
+            user.save()
+
+    await sync_to_async(save)()
+
+    return render(UserSerializer(user).data, status.HTTP_201_CREATED)
+
+
+@async_api_view(["POST"])
+async def login(request):
+    # Same contract as `TokenObtainPairView`.
+    errors = {
+        field: ["This field is required."]
+        for field in ("username", "password")
+        if not request.data.get(field)
+    }
+    if errors:
+        raise ValidationError(errors)
+
+    user = await sync_to_async(
+        User.objects.filter(username=request.data["username"]).first
+    )()
+
+    if user is None:
+        # Hash anyway, so response times do not reveal which usernames exist.
+        await amake_password(request.data["password"])
+    elif user.is_active and await acheck_password(
+        request.data["password"], user.password
+    ):
+        refresh = RefreshToken.for_user(user)
+        return {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+    raise AuthenticationFailed("No active account found with the given credentials")
@@ -0,0 +1,119 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from django.conf import settings
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from bandkamp.cache import get_generation, user_scope
+from bandkamp.db.routers import is_pinned, read_from
+
+
+class TokenCache:
+    """
+    Bounded, thread-safe LRU of validated tokens and the user they resolved to.
+
+    Entries live until the token expires or `ttl` seconds pass, whichever
+    comes first, and are ignored once the user's cache generation moves on,
+    i.e. after the user is updated, deactivated or deleted. Generations only
+    reach other processes through a shared cache, hence `JWT_AUTH_CACHE`.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, raw_token: bytes) -> Optional[tuple]:
+        with self._lock:
+            entry = self._entries.get(raw_token)
+            if entry is None:
+                return None
+            expires_at, generation, user, validated_token = entry
+            if expires_at <= time.time():
+                del self._entries[raw_token]
+                return None
+            self._entries.move_to_end(raw_token)
+
+        if generation != get_generation(user_scope(user.pk)):
+            self.discard(raw_token)
+            return None
+
+        return user, validated_token
+
+    def set(self, raw_token: bytes, user, validated_token, generation: int) -> None:
+        # `generation` must be read before the user was loaded, so a write
+        # racing with the load leaves a stale generation behind, not a stale user.
+        expires_at = min(time.time() + self.ttl, validated_token["exp"])
+
+        with self._lock:
+            self._entries[raw_token] = (expires_at, generation, user, validated_token)
+            self._entries.move_to_end(raw_token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, raw_token: bytes) -> None:
+        with self._lock:
+            self._entries.pop(raw_token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+tokens = TokenCache(settings.JWT_AUTH_CACHE_SIZE, settings.JWT_AUTH_CACHE_TIMEOUT)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    `JWTAuthentication` that remembers validated tokens, so repeated requests
+    with the same token skip signature verification and the user query.
+    """
+
+    def authenticate(self, request):
+        if not settings.JWT_AUTH_CACHE:
+            return super().authenticate(request)
+
+        raw_token = self.get_request_token(request)
+        if raw_token is None:
+            return None
+
+        return self.get_cached(raw_token) or self.validate(raw_token)
+
+    def get_request_token(self, request) -> Optional[bytes]:
+        header = self.get_header(request)
+        if header is None:
+            return None
+        return self.get_raw_token(header)
+
+    def get_cached(self, raw_token: bytes) -> Optional[tuple]:
+        cached = tokens.get(raw_token)
+        if cached is None:
+            return None
+
+        user, validated_token = cached
+        # Views may mutate `request.user`; the cached snapshot must not be.
+        return copy.copy(user), validated_token
+
+    def validate(self, raw_token: bytes) -> tuple:
+        validated_token = self.get_validated_token(raw_token)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        generation = get_generation(user_scope(user_id))
+        # A replica may not have applied the write that bumped `generation` yet.
+        with read_from(None, is_pinned()):
+            user = self.get_user(validated_token)
+        tokens.set(raw_token, copy.copy(user), validated_token, generation)
+
+        return user, validated_token
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    target_class = CachedJWTAuthentication
@@ -0,0 +1,108 @@
+import logging
+import threading
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from albums.models import Album
+from bandkamp.cache import OWNER_DELETIONS_SCOPE, bump_generation_on_commit
+from search import typeahead
+from songs.models import Song
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+
+def request_deletion(user: User) -> None:
+    """
+    Deactivates `user` right away and hides their catalog from every listing,
+    then starts a best-effort purge once the current transaction commits. The
+    typeahead keeps suggesting the albums until the purge deletes them.
+
+    The purge thread is a daemon and dies with its worker, so it can be lost;
+    `manage.py purge_deleted_users`, run periodically, is what guarantees the
+    catalog is eventually deleted.
+    """
+    user.is_active = False
+    user.deletion_requested_at = timezone.now()
+    user.save(update_fields=["is_active", "deletion_requested_at"])
+
+    # To the caches the catalog is gone, at a cost independent of its size:
+    # counts are cached per model, song listings follow the owner deletions
+    # scope and album details the list scope, which saving the user bumps.
+    bump_generation_on_commit(
+        Album._meta.label_lower, Song._meta.label_lower, OWNER_DELETIONS_SCOPE
+    )
+    transaction.on_commit(lambda: start_purge(user.pk))
+
+
+def start_purge(user_id: int) -> threading.Thread:
+    # Best effort only: a restart or a crash loses the thread, and the purge
+    # is left to `manage.py purge_deleted_users`.
+    thread = threading.Thread(
+        target=_purge_in_background,
+        args=(user_id,),
+        name=f"purge-user-{user_id}",
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def _purge_in_background(user_id: int) -> None:
+    try:
+        purge_user(user_id)
+    except Exception:
+        logger.exception("Purging user %s failed", user_id)
+    finally:
+        connection.close()
+
+
+def remaining(user_id: int) -> dict:
+    return {
+        "songs": Song.objects.filter(album__user_id=user_id).count(),
+        "albums": Album.objects.filter(user_id=user_id).count(),
+    }
+
+
+def purge_user(
+    user_id: int,
+    batch_size: Optional[int] = None,
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> bool:
+    """
+    Deletes the songs, then the albums, then the row of a user whose deletion
+    was requested, `batch_size` rows per transaction, so no single statement
+    holds locks or memory proportional to the catalog. Returns whether the
+    user is gone.
+    """
+    batch_size = batch_size or settings.USER_PURGE_BATCH_SIZE
+    user = User.objects.filter(pk=user_id, deletion_requested_at__isnull=False).first()
+    if user is None:
+        return False
+
+    batches = (
+        ("songs", Song.objects.filter(album__user_id=user_id)),
+        ("albums", Album.objects.filter(user_id=user_id)),
+    )
+    for name, queryset in batches:
+        while True:
+            ids = queryset.order_by("pk").values_list("pk", flat=True)[:batch_size]
+            ids = list(ids)
+            if not ids:
+                break
+            if name == "albums":
+                # Ahead of the deletion, so its per-album signal finds nothing left.
+                typeahead.albums.remove_many(ids)
+            queryset.model.objects.filter(pk__in=ids).delete()
+            logger.info("Purged %s %s of user %s", len(ids), name, user_id)
+            if progress:
+                progress(name, len(ids))
+
+    # Only the now-empty account is left for the cascade collector.
+    user.delete()
+    logger.info("Purged user %s", user_id)
+
+    return True
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    check_password,
+    make_password,
+)
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+THREAD_NAME_PREFIX = "password-hashing"
+
+
+class PasswordHashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many password operations in progress, try again shortly."
+    default_code = "password_hashing_unavailable"
+
+
+class HashingExecutor:
+    """
+    Bounded pool for password hashing.
+
+    At most `PASSWORD_HASHING_WORKERS` hashes run at once, so a burst of
+    logins cannot take every core from the rest of the API, and at most
+    `PASSWORD_HASHING_QUEUE_DEPTH` more may wait for a worker. Beyond that
+    callers get `PasswordHashingUnavailable` (503) instead of queueing forever.
+
+    PBKDF2 runs in OpenSSL with the GIL released, so threads are enough.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[threading.BoundedSemaphore] = None
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._executor is None:
+                workers = settings.PASSWORD_HASHING_WORKERS
+                self._slots = threading.BoundedSemaphore(
+                    workers + settings.PASSWORD_HASHING_QUEUE_DEPTH
+                )
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix=THREAD_NAME_PREFIX
+                )
+
+    def reset(self) -> None:
+        # Worker threads do not survive a fork; the child starts its own pool.
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+
+    def submit(self, function: Callable, *args, wait: bool = True) -> Future:
+        if self._executor is None:
+            self._start()
+
+        timeout = settings.PASSWORD_HASHING_QUEUE_TIMEOUT if wait else None
+        if not self._slots.acquire(blocking=wait, timeout=timeout):
+            raise PasswordHashingUnavailable()
+
+        try:
+            future = self._executor.submit(function, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        return future
+
+    def run(self, function: Callable, *args):
+        return self.submit(function, *args).result()
+
+    async def arun(self, function: Callable, *args):
+        # Never blocks the event loop: a full queue fails immediately.
+        return await asyncio.wrap_future(self.submit(function, *args, wait=False))
+
+
+executor = HashingExecutor()
+os.register_at_fork(after_in_child=executor.reset)
+
+
+def _on_hashing_thread() -> bool:
+    return threading.current_thread().name.startswith(THREAD_NAME_PREFIX)
+
+
+class OffloadedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    Drop-in `pbkdf2_sha256` hasher whose key derivation runs on the bounded
+    hashing executor, covering login, `create_user` and `set_password`.
+
+    The calling thread still waits for the hash: in sync views this bounds how
+    many hashes run at once (and answers 503 past the queue) but does not free
+    the request worker. Only the coroutine views, through `amake_password` and
+    `acheck_password`, give the worker back while hashing.
+    """
+
+    def encode(self, password, salt, iterations=None):
+        if _on_hashing_thread():
+            return super().encode(password, salt, iterations)
+        return executor.run(super().encode, password, salt, iterations)
+
+
+async def amake_password(password: str) -> str:
+    return await executor.arun(make_password, password)
+
+
+async def acheck_password(password: str, encoded: str) -> bool:
+    return await executor.arun(check_password, password, encoded)
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from users.deletion import purge_user, remaining
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Purges the catalogs of users whose deletion was requested, in batches. "
+        "The purges started by the web workers are best effort; run this "
+        "periodically (e.g. from cron) to guarantee every one completes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="only purge this user id")
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument(
+            "--status",
+            action="store_true",
+            help="list pending deletions and what is left of them, then exit",
+        )
+
+    def handle(self, *args, **options):
+        pending = User.objects.filter(deletion_requested_at__isnull=False)
+        if options["user"]:
+            pending = pending.filter(pk=options["user"])
+        pending = pending.order_by("deletion_requested_at")
+
+        if not pending.exists():
+            self.stdout.write("No pending user deletions.")
+            return
+
+        for user in pending.only("pk", "deletion_requested_at"):
+            left = remaining(user.pk)
+            requested_at = f"{user.deletion_requested_at:%Y-%m-%d %H:%M}"
+            self.stdout.write(
+                f"User {user.pk} (requested {requested_at}): "
+                f"{left['albums']} albums, {left['songs']} songs left"
+            )
+            if options["status"]:
+                continue
+
+            deleted = {"songs": 0, "albums": 0}
+
+            def progress(name: str, count: int):
+                deleted[name] += count
+                self.stdout.write(f"  {deleted[name]}/{left[name]} {name} deleted")
+
+            if purge_user(user.pk, options["batch_size"], progress):
+                self.stdout.write(self.style.SUCCESS(f"User {user.pk} purged."))
@@ -6,3 +6,6 @@ class User(AbstractUser):
     full_name = models.CharField(max_length=50, null=True)
     artistic_name = models.CharField(max_length=50)
     email = models.EmailField(unique=True)
+    # Set when the account is deactivated for deletion; its catalog is then
+    # purged in the background (users/deletion.py).
+    deletion_requested_at = models.DateTimeField(null=True, blank=True)
@@ -1,37 +1,85 @@
+from contextlib import contextmanager
+
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from rest_framework import serializers
-from rest_framework.validators import UniqueValidator
+from bandkamp.serializers import ChangedFieldsUpdateMixin
 from .models import User
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(ChangedFieldsUpdateMixin, serializers.ModelSerializer):
+    # Uniqueness is left to the database constraints: checking it up front
+    # costs a query per field and still races with concurrent signups.
+    unique_error_messages = {
+        "username": "A user with that username already exists.",
+        "email": "This field must be unique.",
+    }
+
     class Meta:
         model = User
         fields = ["id", "username", "email", "password", "full_name", "artistic_name"]
         extra_kwargs = {
-            "email": {
-                "validators": [UniqueValidator(queryset=User.objects.all())],
-            },
-            "username": {
-                "validators": [
-                    UniqueValidator(
-                        queryset=User.objects.all(),
-                        message="A user with that username already exists.",
-                    )
-                ],
-            },
+            "email": {"validators": []},
+            "username": {"validators": [UnicodeUsernameValidator()]},
             "password": {"write_only": True},
         }
 
     def create(self, validated_data: dict) -> User:
-        return User.objects.create_user(**validated_data)
+        with self.unique_violations(validated_data):
+            return User.objects.create_user(**validated_data)
+
+    def set_changed_fields(self, instance: User, validated_data: dict) -> list[str]:
+        validated_data = dict(validated_data)
+        password = validated_data.pop("password", None)
+        changed_fields = super().set_changed_fields(instance, validated_data)
+
+        # A new salt makes every password a change, even an identical one.
+        if password is not None:
+            instance.set_password(password)
+            changed_fields.append("password")
+
+        return changed_fields
+
+    def save_changed_fields(self, instance: User, changed_fields: list[str]) -> None:
+        values = {field: getattr(instance, field) for field in changed_fields}
+        with self.unique_violations(values, instance):
+            super().save_changed_fields(instance, changed_fields)
+
+    @contextmanager
+    def unique_violations(self, data: dict, instance: User = None):
+        """
+        Turns a unique constraint violation raised inside the block into the
+        field errors the validators used to return.
+        """
+        try:
+            with transaction.atomic():
+                yield
+        except IntegrityError:
+            errors = self.unique_errors(data, instance)
+            if not errors:
+                raise
+            raise serializers.ValidationError(errors)
+
+    def unique_errors(self, data: dict, instance: User = None) -> dict:
+        values = {
+            field: data[field] for field in self.unique_error_messages if field in data
+        }
+        if "email" in values:
+            values["email"] = User.objects.normalize_email(values["email"])
+        if not values:
+            return {}
 
-    def update(self, instance: User, validated_data: dict) -> User:
-        for key, value in validated_data.items():
-            if key == "password":
-                instance.set_password(value)
-            else:
-                setattr(instance, key, value)
+        # A single query finds every clashing field, not just the one the
+        # database reported first.
+        conflicts = User.objects.filter(Q(**values, _connector=Q.OR))
+        if instance is not None:
+            conflicts = conflicts.exclude(pk=instance.pk)
 
-        instance.save()
+        errors = {}
+        for taken in conflicts.values(*values):
+            for field, value in values.items():
+                if taken[field] == value:
+                    errors[field] = [self.unique_error_messages[field]]
 
-        return instance
+        return errors
@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bandkamp.cache import ALBUM_LIST_SCOPE, bump_generation_on_commit, user_scope
+from .models import User
+
+
+@receiver([post_save, post_delete], sender=User)
+def bump_user_generations(sender, instance: User, **kwargs):
+    # Album listings embed their owner.
+    bump_generation_on_commit(
+        user_scope(instance.pk), ALBUM_LIST_SCOPE, using=kwargs["using"]
+    )
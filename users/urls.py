@@ -1,9 +1,11 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 from rest_framework_simplejwt import views as jwt_views
 
 urlpatterns = [
     path("users/", views.UserView.as_view()),
     path("users/<int:pk>/", views.UserDetailView.as_view()),
     path("users/login/", jwt_views.TokenObtainPairView.as_view()),
+    path("async/users/", async_views.user_create),
+    path("async/users/login/", async_views.login),
 ]
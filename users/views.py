@@ -1,17 +1,27 @@
 from .models import User
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from .authentication import CachedJWTAuthentication
+from .deletion import request_deletion
 from .serializers import UserSerializer
 from .permissions import IsAccountOwner
 from rest_framework.generics import CreateAPIView, RetrieveUpdateDestroyAPIView
+from bandkamp.cache import ConditionalGetMixin, user_scope
 
 
 class UserView(CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    query_budget = {"POST": 1}
 
 
-class UserDetailView(RetrieveUpdateDestroyAPIView):
-    authentication_classes = [JWTAuthentication]
+class UserDetailView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
+    authentication_classes = [CachedJWTAuthentication]
     permission_classes = [IsAccountOwner]
-    queryset = User.objects.all()
+    queryset = User.objects.filter(deletion_requested_at__isnull=True)
     serializer_class = UserSerializer
+
+    def get_generation_scopes(self):
+        return [user_scope(self.kwargs["pk"])]
+
+    def perform_destroy(self, instance: User):
+        # Answers right away; the catalog is purged in batches afterwards.
+        request_deletion(instance)